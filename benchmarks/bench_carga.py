@@ -0,0 +1,292 @@
+"""Teste de carga: N sessões simultâneas no app Streamlit de verdade.
+
+Sobe o dashboard (`streamlit run`, headless, numa porta local) e abre N
+sessões pelo mesmo websocket que o navegador usa. Cada sessão abre a página
+e depois alterna mudanças no filtro de Decisão (rerun do script inteiro) e
+nos seletores de faixas etárias (rerun só do fragmento da seção), como um
+visitante clicando sem parar. As opções alteradas são sorteadas (semente
+fixa por sessão), então as rodadas misturam acertos e faltas no cache de
+painéis. As seções sob demanda ficam abertas (BRIDGE_SOB_DEMANDA=0) para que
+os seletores de faixa existam.
+
+Para cada quantidade de sessões, registra p50/p95/p99 da latência (do envio
+da mudança até o fim da execução no servidor, como o navegador percebe),
+reruns por segundo, CPU média e RSS máximo do processo do servidor (lidos de
+/proc, só Linux). O relatório em JSON (`--json`) pode ser comparado com outro
+(`--comparar`) antes e depois de uma mudança de desempenho.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_carga.py [--sessoes 1 5 10 20] [--interacoes 10] [--pausa 0.2]
+                                     [--json carga.json] [--comparar antes.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = RAIZ / "Dashboard_Bridge_Consolidado.py"
+
+DECISAO = "📌 Filtrar por Tipo de Decisão"
+FAIXAS = ["Filtrar faixas exibidas (bairros)", "Filtrar faixas exibidas (evolução mensal)"]
+TIPOS = ("abertura", "completo", "fragmento")
+
+
+# ----- servidor -----
+
+def _porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def iniciar_app(porta: int, espera: float = 60.0) -> subprocess.Popen:
+    env = {**os.environ, "BRIDGE_SOB_DEMANDA": "0"}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP), "--server.headless", "true",
+         "--server.port", str(porta), "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        cwd=RAIZ, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return processo
+        except OSError:
+            time.sleep(0.2)
+    processo.kill()
+    raise RuntimeError("o app não respondeu ao health check")
+
+
+class Monitor:
+    """Amostra CPU (utime + stime) e RSS do processo do servidor em /proc."""
+
+    def __init__(self, pid: int, intervalo: float = 0.25):
+        self.pid = pid
+        self.intervalo = intervalo
+        self.rss_max = 0.0
+
+    def _cpu(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            campos = f.read().rsplit(")", 1)[1].split()
+        return (int(campos[11]) + int(campos[12])) / os.sysconf("SC_CLK_TCK")
+
+    def _rss_mb(self) -> float:
+        with open(f"/proc/{self.pid}/status") as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+        return 0.0
+
+    async def medir(self, tarefa):
+        """Roda `tarefa` (awaitable); devolve (resultado, cpu %, RSS máximo em MB)."""
+        self.rss_max = self._rss_mb()
+        cpu0, t0 = self._cpu(), time.perf_counter()
+        amostras = asyncio.ensure_future(self._amostrar())
+        try:
+            resultado = await tarefa
+        finally:
+            amostras.cancel()
+        cpu = (self._cpu() - cpu0) / (time.perf_counter() - t0) * 100
+        return resultado, cpu, max(self.rss_max, self._rss_mb())
+
+    async def _amostrar(self):
+        while True:
+            self.rss_max = max(self.rss_max, self._rss_mb())
+            await asyncio.sleep(self.intervalo)
+
+
+# ----- sessão simulada -----
+
+class Sessao:
+    def __init__(self, porta: int, semente: int):
+        self.url = f"ws://127.0.0.1:{porta}/_stcore/stream"
+        self.rng = random.Random(semente)
+        self.seletores = {}  # rótulo -> {"id", "opcoes", "valor", "fragmento"}
+        self.estados = {}  # id -> lista de opções escolhidas (só os widgets já alterados)
+        self.ws = None
+
+    async def abrir(self) -> float:
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return await self._rodar()
+
+    async def fechar(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _rodar(self, fragmento: str = "") -> float:
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.fragment_id = fragmento
+        for wid, valor in self.estados.items():
+            estado = msg.rerun_script.widget_states.widgets.add()
+            estado.id = wid
+            estado.string_array_value.data.extend(valor)
+        inicio = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            resposta = ForwardMsg()
+            resposta.ParseFromString(await self.ws.recv())
+            tipo = resposta.WhichOneof("type")
+            if tipo == "script_finished":
+                return time.perf_counter() - inicio
+            if tipo == "delta" and resposta.delta.WhichOneof("type") == "new_element":
+                elemento = resposta.delta.new_element
+                if elemento.WhichOneof("type") == "multiselect":
+                    self._registrar(elemento.multiselect, resposta.delta.fragment_id)
+
+    def _registrar(self, ms, fragmento):
+        opcoes = list(ms.options)
+        self.seletores[ms.label] = {
+            "id": ms.id,
+            "opcoes": opcoes,
+            "valor": self.estados.get(ms.id, [opcoes[i] for i in ms.default]),
+            "fragmento": fragmento,
+        }
+
+    def _alternar(self, rotulo: str) -> str:
+        seletor = self.seletores[rotulo]
+        opcao = self.rng.choice(seletor["opcoes"])
+        valor = [v for v in seletor["valor"] if v != opcao]
+        if len(valor) == len(seletor["valor"]):
+            valor.append(opcao)
+        self.estados[seletor["id"]] = seletor["valor"] = valor
+        return seletor["fragmento"]
+
+    async def mudar_decisao(self) -> float:
+        self._alternar(DECISAO)
+        return await self._rodar()
+
+    async def mudar_faixas(self) -> float:
+        fragmento = self._alternar(self.rng.choice(FAIXAS))
+        return await self._rodar(fragmento)
+
+
+async def visitante(porta, semente, interacoes, pausa, latencias):
+    sessao = Sessao(porta, semente)
+    try:
+        latencias["abertura"].append(await sessao.abrir())
+        for i in range(interacoes):
+            await asyncio.sleep(sessao.rng.uniform(0, 2 * pausa))
+            if i % 2 == 0:
+                latencias["completo"].append(await sessao.mudar_decisao())
+            else:
+                latencias["fragmento"].append(await sessao.mudar_faixas())
+    finally:
+        await sessao.fechar()
+
+
+# ----- relatório -----
+
+def _percentil(valores, p) -> float:
+    ordenados = sorted(valores)
+    if not ordenados:
+        return float("nan")
+    return ordenados[min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))]
+
+
+async def rodada(porta, pid, sessoes, interacoes, pausa) -> dict:
+    latencias = {tipo: [] for tipo in TIPOS}
+    inicio = time.perf_counter()
+    _, cpu, rss = await Monitor(pid).medir(asyncio.gather(*(
+        visitante(porta, semente, interacoes, pausa, latencias) for semente in range(sessoes)
+    )))
+    duracao = time.perf_counter() - inicio
+    resultado = {"sessoes": sessoes, "duracao_s": round(duracao, 2), "cpu_pct": round(cpu, 1),
+                 "rss_mb_max": round(rss, 1),
+                 "reruns_por_s": round((len(latencias["completo"]) + len(latencias["fragmento"])) / duracao, 2)}
+    for tipo, valores in latencias.items():
+        resultado[tipo] = {f"p{p}": round(_percentil(valores, p) * 1000, 1) for p in (50, 95, 99)}
+        resultado[tipo]["n"] = len(valores)
+    return resultado
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def imprimir(rodadas):
+    print(f"{'sessões':>7} {'tipo':<10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+          f" {'reruns/s':>9} {'CPU %':>6} {'RSS (MB)':>9}")
+    for r in rodadas:
+        for i, tipo in enumerate(TIPOS):
+            lat = r[tipo]
+            extra = f" {r['reruns_por_s']:>9.2f} {r['cpu_pct']:>6.0f} {r['rss_mb_max']:>9.0f}" if i == 0 else ""
+            print(f"{r['sessoes'] if i == 0 else '':>7} {tipo:<10} {lat['p50']:>9.1f} {lat['p95']:>9.1f}"
+                  f" {lat['p99']:>9.1f}{extra}")
+
+
+def comparar(antes: dict, depois: dict):
+    """p95 por tipo, CPU e RSS lado a lado para as quantidades de sessões em comum."""
+    anteriores = {r["sessoes"]: r for r in antes["rodadas"]}
+    print(f"\ncomparação: {antes.get('commit') or 'antes'} -> {depois.get('commit') or 'depois'}")
+    print(f"{'sessões':>7} {'métrica':<14} {'antes':>9} {'depois':>9} {'razão':>7}")
+    for r in depois["rodadas"]:
+        a = anteriores.get(r["sessoes"])
+        if a is None:
+            continue
+        linhas = [(f"p95 {tipo}", a[tipo]["p95"], r[tipo]["p95"]) for tipo in TIPOS]
+        linhas += [("CPU %", a["cpu_pct"], r["cpu_pct"]), ("RSS (MB)", a["rss_mb_max"], r["rss_mb_max"])]
+        for i, (nome, x, y) in enumerate(linhas):
+            razao = f"{y / x:.2f}x" if x else "-"
+            print(f"{r['sessoes'] if i == 0 else '':>7} {nome:<14} {x:>9.1f} {y:>9.1f} {razao:>7}")
+
+
+async def executar(args) -> dict:
+    porta = _porta_livre()
+    processo = iniciar_app(porta)
+    try:
+        # aquecimento: carga dos dados e caches de painéis antes das medições
+        await visitante(porta, -1, 2, 0, {tipo: [] for tipo in TIPOS})
+        rodadas = []
+        for sessoes in args.sessoes:
+            rodadas.append(await rodada(porta, processo.pid, sessoes, args.interacoes, args.pausa))
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+    return {
+        "commit": _commit(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "cpus": os.cpu_count(),
+        "parametros": {"interacoes": args.interacoes, "pausa": args.pausa},
+        "rodadas": rodadas,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--interacoes", type=int, default=10, help="mudanças de filtro por sessão")
+    parser.add_argument("--pausa", type=float, default=0.2, help="pausa média (s) entre mudanças")
+    parser.add_argument("--json", type=Path, help="grava o relatório neste arquivo")
+    parser.add_argument("--comparar", type=Path, help="relatório anterior (JSON) para comparação")
+    args = parser.parse_args()
+
+    relatorio = asyncio.run(executar(args))
+    imprimir(relatorio["rodadas"])
+    if args.json:
+        args.json.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.comparar:
+        comparar(json.loads(args.comparar.read_text(encoding="utf-8")), relatorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Tempo de partida a frio (sem snapshots): carga serial x paralela das planilhas.
+
+Cada rodada copia as planilhas para uma pasta temporária vazia, de modo que
+todas precisam ser parseadas do .xlsx.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_cold_start.py [--repeticoes 3]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import bridge_data  # noqa: E402
+
+
+def _tarefas(pasta: Path) -> dict:
+    tarefas = {
+        ("consolidado", ano): (caminho, bridge_data.aba_consolidado(ano), bridge_data.COLUNAS_CONSOLIDADO)
+        for ano, caminho in bridge_data.descobrir_anos(pasta).items()
+    }
+    tarefas[("start", 0)] = (pasta / "Paricipantes_Start.xlsx", 0, ["Telefone"])
+    return tarefas
+
+
+def _copiar_planilhas(destino: Path):
+    for caminho in RAIZ.glob("*.xlsx"):
+        shutil.copy2(caminho, destino / caminho.name)
+
+
+def serial(pasta):
+    for tarefa in _tarefas(pasta).values():
+        bridge_data.ler_aba(*tarefa)
+
+
+def threads(pasta):
+    for futuro in bridge_data.pre_carregar(_tarefas(pasta)).values():
+        futuro.result()
+
+
+def processos(pasta):
+    for futuro in bridge_data.pre_carregar(_tarefas(pasta), processos=True).values():
+        futuro.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{len(_tarefas(RAIZ))} abas; melhor de {args.repeticoes} rodadas")
+    with tempfile.TemporaryDirectory() as tmp:
+        # aquecimento: imports do openpyxl/pandas não entram na medição
+        _copiar_planilhas(Path(tmp))
+        serial(Path(tmp))
+    for nome, func in [("serial", serial), ("threads", threads), ("processos", processos)]:
+        tempos = []
+        for _ in range(args.repeticoes):
+            with tempfile.TemporaryDirectory() as tmp:
+                pasta = Path(tmp)
+                _copiar_planilhas(pasta)
+                t0 = time.perf_counter()
+                func(pasta)
+                tempos.append(time.perf_counter() - t0)
+        print(f"{nome:<10} {min(tempos) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Leitura do consolidado: `pd.read_excel` (aba inteira) x streaming só das colunas usadas.
+
+Cada leitor roda num processo novo, para medir o pico de memória (RSS máximo
+acima do processo já com as bibliotecas importadas) sem interferência do
+outro. Usa as planilhas reais e, com `--linhas`, planilhas sintéticas
+(`dados_sinteticos`) maiores.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_leitura.py [--linhas 10000 100000]
+"""
+import argparse
+import multiprocessing as mp
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import pandas as pd  # noqa: E402
+
+import bridge_data  # noqa: E402
+from dados_sinteticos import gerar, gravar_planilha  # noqa: E402
+
+
+def _read_excel(caminho, aba):
+    return pd.read_excel(caminho, sheet_name=aba)
+
+
+def _streaming(caminho, aba):
+    return bridge_data.ler_xlsx_colunas(caminho, aba, bridge_data.COLUNAS_CONSOLIDADO)
+
+
+LEITORES = {"read_excel": _read_excel, "streaming": _streaming}
+
+
+def _medir(nome, caminho, aba, fila):
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    df = LEITORES[nome](caminho, aba)
+    segundos = time.perf_counter() - t0
+    pico_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024  # ru_maxrss em KB (Linux)
+    fila.put((segundos, pico_mb, bridge_data.memoria_mb(df), len(df)))
+
+
+def medir(nome, caminho, aba):
+    ctx = mp.get_context("fork")
+    fila = ctx.Queue()
+    proc = ctx.Process(target=_medir, args=(nome, caminho, aba, fila))
+    proc.start()
+    resultado = fila.get()
+    proc.join()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="*", default=[10000, 100000])
+    args = parser.parse_args()
+
+    planilhas = [(caminho, bridge_data.aba_consolidado(ano)) for ano, caminho in bridge_data.descobrir_anos(RAIZ).items()]
+    with tempfile.TemporaryDirectory() as tmp:
+        for linhas in args.linhas:
+            caminho = Path(tmp) / f"sintetica_{linhas}.xlsx"
+            planilhas.append((gravar_planilha(gerar(linhas, 2026), caminho, 2026), "2026 Consolidado"))
+
+        print(f"{'planilha':<30}{'linhas':>8}{'leitor':>12}{'tempo (s)':>11}{'pico (MB)':>11}{'frame (MB)':>12}")
+        for caminho, aba in planilhas:
+            for nome in LEITORES:
+                segundos, pico_mb, frame_mb, n = medir(nome, caminho, aba)
+                print(f"{caminho.name:<30}{n:>8}{nome:>12}{segundos:>11.2f}{pico_mb:>11.1f}{frame_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
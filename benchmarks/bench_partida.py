@@ -0,0 +1,105 @@
+"""Partida do servidor: importação, tempo até ficar pronto e primeira requisição.
+
+Mede separadamente:
+- importação: módulos do topo do script num interpretador novo e, à parte,
+  o que foi adiado para o primeiro gráfico/data (plotly.express e Babel; o
+  pacote plotly em si já vem com o Streamlit);
+- para `streamlit run` e `bridge_servidor.py` (aquecimento antes de abrir a
+  porta): tempo da partida até /_stcore/health responder e latência da
+  primeira e da segunda abertura da página (websocket, como o navegador).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_partida.py [--repeticoes 3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_carga import APP, Sessao, _porta_livre  # noqa: E402
+
+IMPORTS_SCRIPT = "import streamlit, bridge_tempos, bridge_data, bridge_cubo, bridge_figuras, bridge_cache, bridge_vigia"
+IMPORTS_ADIADOS = "import plotly.express, babel.dates"
+
+MODOS = {
+    "streamlit run": [sys.executable, "-m", "streamlit", "run", str(APP), "--server.headless", "true",
+                      "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false", "--server.port"],
+    "bridge_servidor": [sys.executable, str(RAIZ / "bridge_servidor.py"), "--porta"],
+}
+
+
+def tempo_importacao() -> tuple:
+    """(módulos do script, importações adiadas) em segundos, num interpretador novo."""
+    medir = (f"import time; t = time.perf_counter(); {IMPORTS_SCRIPT}; a = time.perf_counter() - t; "
+             f"t = time.perf_counter(); {IMPORTS_ADIADOS}; print(a, time.perf_counter() - t)")
+    saida = subprocess.run([sys.executable, "-c", medir], cwd=RAIZ, capture_output=True, text=True, check=True)
+    script, adiado = saida.stdout.strip().splitlines()[-1].split()
+    return float(script), float(adiado)
+
+
+def _esperar_saude(porta: int, processo, espera: float = 300.0):
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite and processo.poll() is None:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("o servidor não ficou pronto")
+
+
+async def _duas_aberturas(porta: int):
+    tempos = []
+    for semente in range(2):
+        sessao = Sessao(porta, semente)
+        try:
+            tempos.append(await sessao.abrir())
+        finally:
+            await sessao.fechar()
+    return tempos
+
+
+def partida(comando) -> tuple:
+    """(até pronto, primeira abertura, segunda abertura) em segundos."""
+    porta = _porta_livre()
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando + [str(porta)], cwd=RAIZ, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, env=dict(os.environ))
+    try:
+        _esperar_saude(porta, processo)
+        pronto = time.perf_counter() - inicio
+        primeira, segunda = asyncio.run(_duas_aberturas(porta))
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+    return pronto, primeira, segunda
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    importacoes = [tempo_importacao() for _ in range(args.repeticoes)]
+    script, adiado = (statistics.median(t[i] for t in importacoes) for i in range(2))
+    print(f"importação do script: {script:.2f} s (+{adiado:.2f} s adiados para o primeiro gráfico)\n")
+
+    print(f"mediana de {args.repeticoes} partidas")
+    print(f"{'modo':<18}{'até pronto':>12}{'1ª abertura':>13}{'2ª abertura':>13}")
+    for modo, comando in MODOS.items():
+        tempos = [partida(comando) for _ in range(args.repeticoes)]
+        pronto, primeira, segunda = (statistics.median(t[i] for t in tempos) for i in range(3))
+        print(f"{modo:<18}{pronto:>11.2f}s{primeira:>12.2f}s{segunda:>12.2f}s")
+
+
+if __name__ == "__main__":
+    main()
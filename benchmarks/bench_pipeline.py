@@ -0,0 +1,136 @@
+"""Tempo de cada etapa do pipeline do dashboard em dados sintéticos de vários tamanhos.
+
+Para cada tamanho, gera uma planilha com `dados_sinteticos` numa pasta
+temporária e mede, sem Streamlit: carga do .xlsx (em streaming, só as colunas
+usadas, com `bridge_data.ler_xlsx_colunas`, como no dashboard) e do snapshot,
+normalização (`bridge_data.preparar`), agregação (cubo), filtro por Decisão
+no cubo, materialização das visões por decisão, composição de uma seleção a
+partir delas e montagem das figuras de cada painel. A leitura do .xlsx é
+medida uma vez por tamanho (é a etapa mais cara); as demais, melhor de
+`--repeticoes`.
+
+O resultado sai em JSON (`--json arquivo`, ou `-` para stdout) para comparar
+rodadas e achar regressões; a tabela legível vai para stdout/stderr.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_pipeline.py [--tamanhos 1000 10000 100000] [--json resultados.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import bridge_cubo  # noqa: E402
+import bridge_data  # noqa: E402
+import bridge_figuras  # noqa: E402
+import bridge_visoes  # noqa: E402
+from dados_sinteticos import gerar, gravar_planilha  # noqa: E402
+
+ANO = 2026
+DECISAO_FILTRO = ["Aceitou Jesus"]
+DECISAO_FILTRO_COMPOSTO = ["Aceitou Jesus", "Reconciliou com Jesus"]
+
+
+def _melhor_tempo(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - t0)
+    return min(tempos)
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(linhas: int, repeticoes: int, pasta: Path) -> dict:
+    """Segundos por etapa para uma planilha sintética de `linhas` registros."""
+    caminho = gravar_planilha(gerar(linhas, ANO), pasta / f"Consolidado_Bridge_{ANO}.xlsx", ANO)
+    aba = bridge_data.aba_consolidado(ANO)
+    etapas = {}
+
+    colunas = bridge_data.COLUNAS_CONSOLIDADO
+    t0 = time.perf_counter()
+    bruto = bridge_data.ler_xlsx_colunas(caminho, aba, colunas)
+    etapas["carga_xlsx"] = time.perf_counter() - t0
+    bridge_data.ler_aba(caminho, aba, colunas)  # grava o snapshot
+    etapas["carga_snapshot"] = _melhor_tempo(lambda: bridge_data.ler_aba(caminho, aba, colunas), repeticoes)
+
+    etapas["normalizacao"] = _melhor_tempo(lambda: bridge_data.preparar(bruto.copy()), repeticoes)
+    df = bridge_data.preparar(bruto.copy())
+    etapas["agregacao"] = _melhor_tempo(lambda: bridge_cubo.montar_cubo(df), repeticoes)
+    cubo = bridge_cubo.montar_cubo(df)
+    etapas["filtro"] = _melhor_tempo(lambda: bridge_cubo.filtrar(cubo, DECISAO_FILTRO), repeticoes)
+    # sem planilha do Start aqui: o cubo do Start é vazio
+    cubos = {ANO: (cubo, cubo.iloc[:0])}
+    etapas["visoes"] = _melhor_tempo(lambda: bridge_visoes.materializar(cubos), repeticoes)
+    visoes = bridge_visoes.materializar(cubos)[ANO]
+    etapas["composicao"] = _melhor_tempo(
+        lambda: bridge_visoes.metricas(bridge_visoes.compor(visoes, DECISAO_FILTRO_COMPOSTO)), repeticoes
+    )
+
+    faixas = bridge_data.FAIXAS_ETARIAS[:5]
+    paineis = {
+        "figuras_decisoes": lambda: bridge_figuras.painel_decisoes(visoes, DECISAO_FILTRO),
+        "figuras_geral": lambda: bridge_figuras.painel_geral(cubo),
+        "figuras_bairro_faixa": lambda: bridge_figuras.painel_bairro_faixa(cubo, faixas),
+        "figuras_evolucao_faixa": lambda: bridge_figuras.painel_evolucao_faixa(cubo, faixas),
+    }
+    for nome, construir in paineis.items():
+        etapas[nome] = _melhor_tempo(construir, repeticoes)
+
+    return {"linhas": linhas, "linhas_cubo": len(cubo), "memoria_mb": round(bridge_data.memoria_mb(df), 2),
+            "etapas": etapas}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--json", help="arquivo de saída em JSON ('-' = stdout)")
+    args = parser.parse_args()
+
+    tabela = sys.stderr if args.json == "-" else sys.stdout
+    resultados = []
+    for linhas in args.tamanhos:
+        with tempfile.TemporaryDirectory() as tmp:
+            res = medir(linhas, args.repeticoes, Path(tmp))
+        resultados.append(res)
+        print(f"\n{linhas} linhas (cubo: {res['linhas_cubo']} linhas, df: {res['memoria_mb']} MB)", file=tabela)
+        for etapa, segundos in res["etapas"].items():
+            print(f"  {etapa:<24}{segundos * 1000:>10.1f} ms", file=tabela)
+
+    if args.json:
+        saida = {
+            "gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "repeticoes": args.repeticoes,
+            "resultados": resultados,
+        }
+        texto = json.dumps(saida, ensure_ascii=False, indent=2)
+        if args.json == "-":
+            print(texto)
+        else:
+            Path(args.json).write_text(texto + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Tempo até os KPIs do topo e até o fim da página, com e sem as seções sob demanda.
+
+Com BRIDGE_SOB_DEMANDA=1 (padrão do app) as seções pesadas abaixo da dobra
+(contatos por mês e análise por faixa etária) ficam fechadas e não são
+calculadas na abertura da página; com 0, tudo é montado como antes. Os tempos
+vêm da instrumentação do app (`bridge_tempos`, ligada aqui): "primeiros_kpis"
+é medido logo após as métricas do topo e "pagina" no fim do script.
+
+Dois cenários por modo: "frio" (caches do processo vazios, como na primeira
+visita após subir o servidor) e "quente" (nova sessão com os caches já
+populados). A carga dos dados é a mesma nos dois modos.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_primeira_pintura.py [--repeticoes 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = RAIZ / "Dashboard_Bridge_Consolidado.py"
+sys.path.insert(0, str(RAIZ))
+
+os.environ["BRIDGE_INSTRUMENTAR"] = "1"
+os.environ.setdefault("BRIDGE_LOG_TEMPOS", os.devnull)
+import bridge_tempos  # noqa: E402  (o app roda no mesmo processo e usa este módulo)
+
+MODOS = {"sob demanda": "1", "tudo": "0"}
+
+
+def sessao():
+    """Uma sessão nova: devolve (primeiros_kpis, pagina) em segundos."""
+    AppTest.from_file(str(APP), default_timeout=300).run()
+    return bridge_tempos.ultimo("primeiros_kpis"), bridge_tempos.ultimo("pagina")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"mediana de {args.repeticoes} sessões novas")
+    print(f"{'modo':<14}{'cenário':<9}{'até KPIs':>12}{'página':>12}")
+    for modo, valor in MODOS.items():
+        os.environ["BRIDGE_SOB_DEMANDA"] = valor
+        frio, quente = [], []
+        for _ in range(args.repeticoes):
+            st.cache_resource.clear()  # dados e painéis recarregados do estado em disco
+            frio.append(sessao())
+            quente.append(sessao())
+        for cenario, tempos in (("frio", frio), ("quente", quente)):
+            kpis = statistics.median(t[0] for t in tempos)
+            pagina = statistics.median(t[1] for t in tempos)
+            print(f"{modo:<14}{cenario:<9}{kpis * 1000:>10.0f}ms{pagina * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Latência de rerun ao mexer nos seletores de faixas etárias.
+
+Antes dos fragmentos, cada mudança num seletor reexecutava o script inteiro;
+agora só o fragmento da seção roda. O `AppTest` sempre faz runs completos, então
+a medição compara o rerun completo (custo "antes") com o tempo do corpo do
+fragmento, medido pela instrumentação do app (`bridge_tempos`, ligada aqui)
+(custo "depois", sem o overhead de ida e volta do navegador).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_rerun.py [--repeticoes 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+APP = RAIZ / "Dashboard_Bridge_Consolidado.py"
+sys.path.insert(0, str(RAIZ))
+
+os.environ["BRIDGE_INSTRUMENTAR"] = "1"
+os.environ.setdefault("BRIDGE_LOG_TEMPOS", os.devnull)
+import bridge_tempos  # noqa: E402  (o app roda no mesmo processo e usa este módulo)
+
+SELETORES = {
+    "bairro_faixa": "Filtrar faixas exibidas (bairros)",
+    "evolucao_faixa": "Filtrar faixas exibidas (evolução mensal)",
+}
+
+
+def _seletor(at, rotulo):
+    return next(m for m in at.multiselect if m.label == rotulo)
+
+
+def medir(at, secao, repeticoes):
+    rotulo = SELETORES[secao]
+    completo, fragmento = [], []
+    for i in range(repeticoes * 2):
+        seletor = _seletor(at, rotulo)
+        opcao = seletor.options[-1]
+        # alterna a última faixa para que cada rodada seja uma mudança real
+        acao = seletor.unselect(opcao) if opcao in seletor.value else seletor.select(opcao)
+        inicio = time.perf_counter()
+        acao.run()
+        completo.append(time.perf_counter() - inicio)
+        fragmento.append(bridge_tempos.ultimo(secao))
+    return statistics.median(completo), statistics.median(fragmento)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    at = AppTest.from_file(str(APP), default_timeout=300)
+    for secao in SELETORES:
+        at.session_state[f"aberta_{secao}"] = True  # seções sob demanda: abre as medidas
+    at.run()
+    at.run()  # aquecimento: caches de dados e de painéis já populados
+
+    print(f"mediana de {args.repeticoes * 2} mudanças por seletor")
+    print(f"{'seção':<16}{'script inteiro':>16}{'só fragmento':>16}")
+    for secao in SELETORES:
+        completo, fragmento = medir(at, secao, args.repeticoes)
+        print(f"{secao:<16}{completo:>15.3f}s{fragmento:>15.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Rótulos das barras: `add_annotation` por linha x `fig_barras_rotuladas`.
+
+Monta o mesmo gráfico de barras (valor dentro, anotação fora nas barras
+pequenas) com 10, 100 e 1000 categorias, pelo laço antigo (`iterrows` +
+`add_annotation`, como em fig_faixa_total) e pelo construtor vetorizado.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_rotulos.py [--categorias 10 100 1000] [--repeticoes 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import bridge_figuras  # noqa: E402
+
+LIMIAR = 15
+DESLOCAMENTO = 2
+
+
+def tabela(categorias: int, semente: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    # cerca de metade das barras abaixo do limiar (recebem anotação externa)
+    return pd.DataFrame({
+        "Categoria": [f"cat {i:04d}" for i in range(categorias)],
+        "Quantidade": rng.integers(1, 2 * LIMIAR, categorias),
+    })
+
+
+def laco(dados: pd.DataFrame):
+    """Implementação anterior: uma chamada de add_annotation por barra pequena."""
+    fig = px.bar(dados, x="Categoria", y="Quantidade", text="Quantidade")
+    fig.update_traces(textposition="inside", insidetextanchor="middle", cliponaxis=False)
+    fig.update_layout(uniformtext_minsize=10, uniformtext_mode="hide")
+    for _, row in dados.iterrows():
+        if 0 < row["Quantidade"] < LIMIAR:
+            fig.add_annotation(
+                x=row["Categoria"],
+                y=row["Quantidade"] + DESLOCAMENTO,
+                text=str(row["Quantidade"]),
+                showarrow=False,
+                xanchor="center",
+                yanchor="bottom",
+                font=dict(size=11)
+            )
+    return fig
+
+
+def vetorizado(dados: pd.DataFrame):
+    return bridge_figuras.fig_barras_rotuladas(
+        dados, "Categoria", "Quantidade", limiar=LIMIAR, deslocamento=DESLOCAMENTO, texto="Quantidade"
+    )
+
+
+def _melhor_tempo(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - t0)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--categorias", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'categorias':>10} {'anotações':>10} {'laço (ms)':>10} {'vetorizado (ms)':>16} {'ganho':>7}")
+    for n in args.categorias:
+        dados = tabela(n)
+        anotacoes = len(vetorizado(dados).layout.annotations)
+        assert anotacoes == len(laco(dados).layout.annotations)
+        t_laco = _melhor_tempo(lambda: laco(dados), args.repeticoes)
+        t_vet = _melhor_tempo(lambda: vetorizado(dados), args.repeticoes)
+        print(f"{n:>10} {anotacoes:>10} {t_laco * 1000:>10.1f} {t_vet * 1000:>16.1f} {t_laco / t_vet:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compara o tempo de leitura das planilhas: .xlsx (openpyxl) x snapshot colunar.
+
+As duas leituras são as do dashboard: só as colunas usadas de cada aba
+(`bridge_data.ler_xlsx_colunas` e o snapshot dessa seleção).
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_snapshot.py [--repeticoes 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import bridge_data  # noqa: E402
+import bridge_start  # noqa: E402
+
+PLANILHAS = [
+    ("Consolidado_Bridge_2026.xlsx", "2026 Consolidado", bridge_data.COLUNAS_CONSOLIDADO),
+    ("Consolidado_Bridge_2025.xlsx", "2025 Consolidado", bridge_data.COLUNAS_CONSOLIDADO),
+    (bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START),
+]
+
+
+def _melhor_tempo(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - t0)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'planilha':<32} {'linhas':>7} {'xlsx (ms)':>10} {'snapshot (ms)':>14} {'ganho':>7}")
+    for nome, aba, colunas in PLANILHAS:
+        caminho = RAIZ / nome
+        if not caminho.exists():
+            continue
+        bridge_data.ler_aba(caminho, aba, colunas)  # garante o snapshot
+        t_xlsx = _melhor_tempo(lambda: bridge_data.ler_xlsx_colunas(caminho, aba, colunas), args.repeticoes)
+        t_snap = _melhor_tempo(lambda: bridge_data.ler_aba(caminho, aba, colunas), args.repeticoes)
+        linhas = len(bridge_data.ler_aba(caminho, aba, colunas))
+        print(f"{nome:<32} {linhas:>7} {t_xlsx * 1000:>10.1f} {t_snap * 1000:>14.2f} {t_xlsx / t_snap:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Gerador de planilhas sintéticas com o mesmo esquema da aba "<ano> Consolidado".
+
+Os valores imitam a planilha real, inclusive as variações "sujas" que a
+normalização precisa resolver: Decisão com caixa/acentos/espaços invisíveis
+diferentes, Bairro com espaços sobrando e NBSP, contato como "sim"/"Não ",
+"--" para campos vazios e telefones em vários formatos.
+
+Uso (na raiz do repositório):
+    python benchmarks/dados_sinteticos.py 100000 --ano 2027 --saida /tmp/Consolidado_Bridge_2027.xlsx
+
+`--saida` é obrigatório e um arquivo existente só é sobrescrito com `--forcar`:
+um Consolidado_Bridge_<ano>.xlsx gravado na raiz substituiria a planilha real
+(ou apareceria como mais um ano no dashboard).
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUNAS = [
+    "Quando", "Onde", "Decisão", "Nome", "Sexo", "Estado Civil", "Idade", "Bairro", "Região",
+    "Telefone", "Whatsapp", "Como conheceu", "Decisão Descrição", "Feedback",
+    "Conseguiu fazer contato?", "Voluntário",
+]
+
+# (valor, peso) — pesos aproximados da planilha real
+DECISOES = [
+    ("Reconciliou com Jesus", 50), ("reconciliou com jesus", 3), ("Reconciliou com\u00a0Jesus", 2),
+    ("Aceitou Jesus", 32), ("Aceitou Jesus ", 3), ("ACEITOU JESUS", 1), ("Aceitou\u200b Jesus", 1),
+    ("Pedido de oração", 11), ("Pedido de oracao", 1), ("pedido  de oração", 1),
+]
+CONTATO = [("Sim", 38), ("Sim ", 9), ("sim", 2), ("Sim  ", 1), ("Não", 37), ("Não ", 11), ("não", 3), ("--", 4)]
+BAIRROS = [
+    "Copacabana", "Leblon", "Vidigal", "Gávea", "Ipanema", "Tijuca", "Rocinha", "Botafogo",
+    "Rio Comprido", "Catumbi", "Leme", "Barra Da Tijuca", "Estácio", "Centro", "Olaria",
+    "Engenho Novo", "Santo Cristo", "Jardim Botânico", "Flamengo", "Praça Da Bandeira",
+    "Taquara", "Lagoa", "Bonsucesso", "Catete", "Caju", "Andaraí", "Méier", "Madureira",
+    "Campo Grande", "Recreio Dos Bandeirantes", "Laranjeiras", "Humaitá", "Urca", "Niterói",
+    "São Gonçalo", "Jacarepaguá", "Penha", "Vila Isabel", "Grajaú", "Maracanã",
+]
+ONDE = [("--", 70), ("culto - domingo", 17), ("culto", 8), ("culto pink", 3), ("culto next", 2)]
+SEXO = [("Feminino", 67), ("Masculino", 33)]
+ESTADO_CIVIL = [("Solteiro", 59), ("Casado", 24), ("Divorciado", 9), ("--", 3), ("União Estável", 3), ("Viúvo", 2)]
+REGIAO = [("Rio De Janeiro / RJ", 60), ("-- / --", 20), ("Rio De Janeiro  / RJ", 8), ("-- / RJ", 4),
+          ("Rio De Janeiro  / --", 4), ("Niterói / RJ", 4)]
+COMO_CONHECEU = [("Um amigo ou parente me trouxe", 73), ("Instagram", 11), ("Já conhecia, simplesmente fui", 5),
+                 ("Assisti um culto Online", 3), ("Passei na frente e entrei", 3), ("Já sou membro", 2), ("--", 3)]
+FEEDBACK = [("Enviei mensagem via WhatsApp", 40), ("Enviei mensagem ", 35), ("Enviada mensagem ", 15),
+            ("Tentando encaminhar ao gc", 10)]
+NOMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduardo", "Fernanda", "Gabriel", "Helena", "Igor", "Juliana",
+         "Lucas", "Mariana", "Nathalia", "Otávio", "Paula", "Rafael", "Sabrina", "Thiago", "Vanessa", "William"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Mota", "Lacerda", "Rocha"]
+VOLUNTARIOS = ["Bruno Sobral", "Camila Reis", "Diego Faria", "Elisa Prado", "Fábio Nunes"]
+
+
+def _sortear(rng, pares, n):
+    valores, pesos = zip(*pares)
+    p = np.asarray(pesos, dtype=float)
+    return rng.choice(np.asarray(valores, dtype=object), size=n, p=p / p.sum())
+
+
+def _bairros_sujos(rng, n):
+    """Bairros com distribuição de cauda longa e variantes de espaço/NBSP."""
+    pesos = 1 / np.arange(1, len(BAIRROS) + 1)
+    bairro = rng.choice(np.asarray(BAIRROS, dtype=object), size=n, p=pesos / pesos.sum())
+    variante = rng.random(n)
+    bairro = np.where(variante < 0.25, bairro + " ", bairro)
+    bairro = np.where((variante >= 0.25) & (variante < 0.28), bairro + "  ", bairro)
+    bairro = np.where((variante >= 0.28) & (variante < 0.30), np.char.replace(bairro.astype(str), " ", "\u00a0"), bairro)
+    return np.where(rng.random(n) < 0.08, "--", bairro)
+
+
+def _telefones(rng, n):
+    """Celulares do RJ em formatos variados ("21 99966-1825", "5521...", 8 dígitos antigos)."""
+    ddd = np.where(rng.random(n) < 0.9, 21, rng.choice([11, 13, 22, 24, 92], size=n))
+    numero = rng.integers(10_000_000, 99_999_999, size=n)
+    base = pd.Series(ddd).astype(str) + " 9" + pd.Series(numero // 10_000).astype(str) + "-" + pd.Series(
+        numero % 10_000).astype(str).str.zfill(4)
+    formato = rng.random(n)
+    so_digitos = base.str.replace(r"\D", "", regex=True)
+    base = base.where(formato >= 0.05, "55" + so_digitos)
+    base = base.where((formato < 0.05) | (formato >= 0.10), so_digitos.str[:2] + " " + so_digitos.str[3:])
+    return base.where(rng.random(n) >= 0.02, "--").to_numpy(dtype=object)
+
+
+def gerar(linhas: int, ano: int = 2026, semente: int = 0) -> pd.DataFrame:
+    """DataFrame com `linhas` registros sintéticos do ano `ano`, na ordem das colunas da planilha real."""
+    rng = np.random.default_rng(semente)
+    inicio = np.datetime64(f"{ano}-01-01")
+    # registros concentrados nos domingos, como nos cultos
+    dias = rng.integers(0, 52, size=linhas) * 7 + rng.choice([0, 0, 0, 3], size=linhas) + 3
+    datas = pd.to_datetime(inicio + dias.astype("timedelta64[D]")).strftime("%d/%m/%Y")
+    idade = np.clip(np.rint(rng.normal(34, 12, size=linhas)), 5, 90).astype("int64")
+    nomes = (pd.Series(rng.choice(NOMES, size=linhas)) + " " + pd.Series(rng.choice(SOBRENOMES, size=linhas)))
+
+    df = pd.DataFrame({
+        "Quando": datas,
+        "Onde": _sortear(rng, ONDE, linhas),
+        "Decisão": _sortear(rng, DECISOES, linhas),
+        "Nome": nomes.to_numpy(dtype=object),
+        "Sexo": _sortear(rng, SEXO, linhas),
+        "Estado Civil": _sortear(rng, ESTADO_CIVIL, linhas),
+        "Idade": idade,
+        "Bairro": _bairros_sujos(rng, linhas),
+        "Região": _sortear(rng, REGIAO, linhas),
+        "Telefone": _telefones(rng, linhas),
+        "Whatsapp": np.where(rng.random(linhas) < 0.995, "Sim", "Não"),
+        "Como conheceu": _sortear(rng, COMO_CONHECEU, linhas),
+        "Decisão Descrição": "--",
+        "Feedback": _sortear(rng, FEEDBACK, linhas),
+        "Conseguiu fazer contato?": _sortear(rng, CONTATO, linhas),
+        "Voluntário": rng.choice(VOLUNTARIOS, size=linhas),
+    })
+    return df[COLUNAS]
+
+
+def gravar_planilha(df: pd.DataFrame, caminho, ano: int) -> Path:
+    """Grava `df` como Consolidado_Bridge (aba "<ano> Consolidado")."""
+    caminho = Path(caminho)
+    with pd.ExcelWriter(caminho, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name=f"{ano} Consolidado", index=False)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("--ano", type=int, default=2026)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", type=Path, required=True, help="arquivo .xlsx a gravar (fora da raiz do repositório)")
+    parser.add_argument("--forcar", action="store_true", help="sobrescreve --saida se já existir")
+    args = parser.parse_args()
+
+    if args.saida.exists() and not args.forcar:
+        parser.error(f"{args.saida} já existe (use --forcar para sobrescrever)")
+    gravar_planilha(gerar(args.linhas, args.ano, args.semente), args.saida, args.ano)
+    print(f"{args.linhas} linhas -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
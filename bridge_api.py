@@ -0,0 +1,192 @@
+"""API JSON somente leitura com os números do dashboard BRIDGE.
+
+Servidor HTTP pequeno (só biblioteca padrão, sem Streamlit) para quem consome
+os números por programa: nenhuma requisição reexecuta o script do dashboard.
+Os dados vêm de um vigia próprio (`bridge_vigia`), como no dashboard: uma
+versão publicada e compartilhada por todas as requisições, recarregada em
+segundo plano quando as planilhas mudam. As respostas são roll-ups do cubo,
+guardadas num cache LRU por (versão dos dados, rota, parâmetros).
+
+Rotas (GET):
+    /metricas   total de decisões, contatos bem-sucedidos, % contatos e média de idade
+    /bairros    ranking de bairros (?n=5)
+    /mensal     decisões por mês (AnoMes, Quantidade)
+    /contatos   contatos por mês (Sim, Não, Total)
+    /faixas     distribuição por faixa etária (Quantidade, Percentual)
+    /versao     anos, versão das planilhas, horário da publicação e decisões disponíveis
+
+Parâmetros (todos opcionais): anos=2026,2025 (padrão: o mais recente com registros),
+decisao=<valor> (repetível), de=AAAA-MM e ate=AAAA-MM (período, inclusive).
+
+Cada resposta leva um ETag derivado da versão dos dados e da consulta; com
+If-None-Match igual, a resposta é 304 sem corpo (e sem cálculo).
+
+Uso (na raiz do repositório):
+    python bridge_api.py [--host 127.0.0.1] [--porta 8502]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import bridge_cache
+import bridge_cubo
+import bridge_data
+import bridge_vigia
+
+log = logging.getLogger("bridge.api")
+
+
+def _registros(tabela) -> list:
+    # to_json converte NaN em null e categorias em texto
+    return json.loads(tabela.to_json(orient="records", force_ascii=False))
+
+
+ROTAS = {
+    "metricas": lambda cubo, n: bridge_cubo.metricas(cubo),
+    "bairros": lambda cubo, n: _registros(bridge_cubo.ranking(cubo, "Bairro", n)),
+    "mensal": lambda cubo, n: _registros(bridge_cubo.serie_mensal(cubo)),
+    "contatos": lambda cubo, n: _registros(bridge_cubo.pivot_contato(cubo)),
+    "faixas": lambda cubo, n: _registros(bridge_cubo.dist_faixa(bridge_cubo.com_faixa(cubo))),
+}
+
+
+class ConsultaInvalida(ValueError):
+    pass
+
+
+def ler_consulta(query: str, disponiveis) -> dict:
+    """Parâmetros normalizados (a mesma consulta escrita de outro jeito dá a mesma chave)."""
+    params = parse_qs(query)
+    try:
+        anos = sorted({int(a) for valor in params.get("anos", []) for a in valor.split(",") if a})
+    except ValueError:
+        raise ConsultaInvalida(f"anos inválidos: {','.join(params['anos'])!r} (use anos=2026,2025)") from None
+    try:
+        de = bridge_data.ordinal_mes(params["de"][0]) if "de" in params else None
+        ate = bridge_data.ordinal_mes(params["ate"][0]) if "ate" in params else None
+    except ValueError as exc:
+        raise ConsultaInvalida(str(exc)) from exc
+    try:
+        n = int(params["n"][0]) if "n" in params else 5
+    except ValueError:
+        raise ConsultaInvalida(f"n inválido: {params['n'][0]!r}") from None
+    anos = anos or bridge_data.anos_padrao(disponiveis)
+    faltando = [ano for ano in anos if ano not in disponiveis]
+    if faltando:
+        raise ConsultaInvalida(f"planilha não encontrada para: {', '.join(map(str, faltando))}")
+    return {
+        "anos": tuple(anos),
+        "decisoes": tuple(sorted(set(params.get("decisao", [])))),
+        "de": de,
+        "ate": ate,
+        "n": max(n, 1),
+    }
+
+
+class Api:
+    def __init__(self, vigia, maxsize: int = 256, max_mb: float = 32):
+        self.vigia = vigia
+        # respostas já serializadas; tamanho = bytes do JSON
+        self.cache = bridge_cache.CacheLRU(maxsize=maxsize, max_mb=max_mb, tamanho=len)
+        vigia.ao_publicar(lambda dados: self.cache.descartar(lambda chave: not self._vigente(chave, dados)))
+
+    @staticmethod
+    def _vigente(chave, dados) -> bool:
+        versao = chave[0]
+        return all(ano in dados["anos"] and dados["anos"][ano]["versao"] == v for ano, v in versao)
+
+    def responder(self, rota: str, consulta: dict, etag_cliente=None):
+        """Devolve (status, etag, corpo); corpo None quando o ETag do cliente ainda vale."""
+        dados = self.vigia.obter(consulta["anos"])
+        versao = tuple((ano, dados["anos"][ano]["versao"]) for ano in consulta["anos"])
+        chave = (versao, rota, tuple(sorted(consulta.items())))
+        etag = '"' + hashlib.sha1(repr(chave).encode("utf-8")).hexdigest()[:20] + '"'
+        if etag_cliente and etag in [e.strip() for e in etag_cliente.split(",")]:
+            return HTTPStatus.NOT_MODIFIED, etag, None
+        corpo = self.cache.obter(chave, lambda: self._montar(rota, consulta, dados, versao))
+        return HTTPStatus.OK, etag, corpo
+
+    def _montar(self, rota, consulta, dados, versao) -> bytes:
+        if rota == "versao":
+            resultado = {
+                "anos": {str(ano): v for ano, v in versao},
+                "publicada_em": dados["criada_em"].isoformat(timespec="seconds"),
+                "decisoes": list(dict.fromkeys(
+                    d for ano in consulta["anos"] for d in dados["anos"][ano]["info"]["decisoes"]
+                )),
+            }
+        else:
+            cubo = bridge_cubo.combinar(dados["anos"][ano]["cubo"] for ano in consulta["anos"])
+            cubo = bridge_cubo.periodo(bridge_cubo.filtrar(cubo, list(consulta["decisoes"])),
+                                       consulta["de"], consulta["ate"])
+            resultado = ROTAS[rota](cubo, consulta["n"])
+        return json.dumps(resultado, ensure_ascii=False).encode("utf-8")
+
+
+def criar_handler(api: Api):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "BridgeAPI/1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            rota = url.path.strip("/")
+            if rota not in ROTAS and rota != "versao":
+                return self._enviar(HTTPStatus.NOT_FOUND, {"erro": f"rota desconhecida: /{rota}",
+                                                           "rotas": [*ROTAS, "versao"]})
+            try:
+                consulta = ler_consulta(url.query, bridge_data.descobrir_anos(api.vigia.pasta))
+                status, etag, corpo = api.responder(rota, consulta, self.headers.get("If-None-Match"))
+            except ConsultaInvalida as exc:
+                return self._enviar(HTTPStatus.BAD_REQUEST, {"erro": str(exc)})
+            except Exception as exc:  # planilha ilegível ou ainda carregando com erro
+                log.exception("falha ao responder %s", self.path)
+                return self._enviar(HTTPStatus.SERVICE_UNAVAILABLE, {"erro": str(exc)})
+            self._enviar(status, corpo, etag)
+
+        def _enviar(self, status, corpo, etag=None):
+            if isinstance(corpo, dict):
+                corpo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")  # o cliente sempre revalida pelo ETag
+            if corpo is not None:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            if corpo is not None:
+                self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            log.info("%s " + formato, self.address_string(), *args)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8502)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    vigia = bridge_vigia.Vigia().iniciar(bridge_data.anos_padrao(bridge_data.descobrir_anos()))
+    servidor = ThreadingHTTPServer((args.host, args.porta), criar_handler(Api(vigia)))
+    log.info("API em http://%s:%d/", args.host, args.porta)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        vigia.parar()
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
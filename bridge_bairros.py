@@ -0,0 +1,197 @@
+"""Dicionário canônico de bairros.
+
+O campo Bairro é digitado à mão: além de espaços (já tratados na
+normalização), o mesmo bairro aparece com e sem acento, com outra caixa ou
+com erro de digitação ("Gavea", "Sao Conrado", "Copacaba"), e cada grafia
+virava uma barra separada no Top 5/Top 10 e no empilhado Bairro x Faixa.
+
+O dicionário (`bairros.json`, na pasta das planilhas) lista os nomes
+canônicos e as variantes conhecidas (variante -> canônico). Cada valor é
+resolvido, nesta ordem:
+1. pela chave dobrada (sem acentos, minúsculas, só letras e dígitos), contra
+   os canônicos e as variantes: acento, caixa e pontuação não contam;
+2. pelo índice de trigramas das chaves canônicas: uma grafia nova com
+   similaridade (Dice) >= SIMILARIDADE_MINIMA a um único canônico fica com ele,
+   a não ser que o valor traga um complemento (parênteses, " - RJ", barra,
+   vírgula, número ou palavras a mais que o canônico): "Freguesia (Ilha)" ou
+   "Botafogo - RJ" podem ser outro bairro e só entram pelo dicionário;
+3. sem correspondência, o valor fica como veio e entra no relatório de
+   bairros fora do dicionário, com a melhor sugestão do índice.
+
+A resolução é feita uma vez por valor distinto (a normalização já trabalha
+por valor distinto) e guardada num cache do dicionário, que vale enquanto o
+arquivo não muda; a coluna resultante é categórica, e os agrupamentos do cubo
+usam os códigos inteiros das categorias. A versão do dicionário entra na
+versão dos dados (`bridge_incremental`): editar o arquivo refaz as partições.
+
+Relatório dos valores fora do dicionário (todos os anos):
+    python bridge_bairros.py
+"""
+import hashlib
+import json
+import re
+import sys
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+ARQUIVO_BAIRROS = "bairros.json"
+FORMATO = 1
+SIMILARIDADE_MINIMA = 0.8  # Dice dos trigramas para aceitar uma grafia aproximada
+SIMILARIDADE_SUGESTAO = 0.5  # abaixo disso, o relatório não sugere nada
+# complemento que qualifica o nome: parênteses, " - UF", barra, vírgula, número
+COMPLEMENTO = re.compile(r"[()/,\d]|\s[-–]\s")
+
+
+def dobrar(texto: str) -> str:
+    """Chave de comparação: sem acentos, minúsculas, palavras separadas por um espaço."""
+    sem_acento = "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[\W_]+", " ", sem_acento.casefold()).split())
+
+
+def trigramas(chave: str) -> frozenset:
+    s = f"  {chave} "
+    return frozenset(s[i:i + 3] for i in range(len(s) - 2))
+
+
+def qualificado(valor: str, nome: str) -> bool:
+    """`valor` acrescenta um complemento a `nome` (não é só outra grafia dele)?"""
+    return bool(COMPLEMENTO.search(valor)) or set(dobrar(nome).split()) < set(dobrar(valor).split())
+
+
+class Dicionario:
+    def __init__(self, bairros=(), variantes=None, versao=""):
+        self.versao = versao
+        self.bairros = list(bairros)
+        self._por_chave = {dobrar(nome): nome for nome in self.bairros}
+        for variante, nome in (variantes or {}).items():
+            self._por_chave.setdefault(dobrar(variante), nome)
+        # índice invertido: trigrama -> canônicos que o contêm
+        self._trigramas = {nome: trigramas(dobrar(nome)) for nome in self.bairros}
+        self._indice = defaultdict(list)
+        for nome, tris in self._trigramas.items():
+            for tri in tris:
+                self._indice[tri].append(nome)
+        self._cache = {}  # valor -> (canônico ou None, similaridade)
+        self._lock = threading.Lock()
+
+    def _mais_proximos(self, chave: str):
+        """[(similaridade, canônico)] em ordem decrescente, só dos que dividem algum trigrama."""
+        tris = trigramas(chave)
+        comuns = Counter(nome for tri in tris for nome in self._indice.get(tri, ()))
+        return sorted(
+            ((2 * n / (len(tris) + len(self._trigramas[nome])), nome) for nome, n in comuns.items()),
+            reverse=True,
+        )
+
+    def resolver(self, valor: str):
+        """(canônico, similaridade) de `valor`; canônico None se não há correspondência."""
+        resolvido = self._cache.get(valor)
+        if resolvido is not None:
+            return resolvido
+        chave = dobrar(valor)
+        if chave in self._por_chave:
+            resolvido = (self._por_chave[chave], 1.0)
+        elif len(chave) < 3:
+            resolvido = (None, 0.0)
+        else:
+            candidatos = self._mais_proximos(chave)
+            if not candidatos:
+                resolvido = (None, 0.0)
+            else:
+                similaridade, nome = candidatos[0]
+                empate = len(candidatos) > 1 and candidatos[1][0] == similaridade
+                aceito = (similaridade >= SIMILARIDADE_MINIMA and not empate
+                          and not qualificado(valor, nome))
+                resolvido = (nome if aceito else None, similaridade)
+        with self._lock:
+            self._cache[valor] = resolvido
+        return resolvido
+
+    def canonico(self, valor: str) -> str:
+        """Nome canônico de `valor` (o próprio valor, se fora do dicionário)."""
+        return self.resolver(valor)[0] or valor
+
+    def sugestao(self, valor: str):
+        """Canônico mais parecido (mesmo abaixo do mínimo para resolver) ou None."""
+        candidatos = self._mais_proximos(dobrar(valor))
+        if candidatos and candidatos[0][0] >= SIMILARIDADE_SUGESTAO:
+            return candidatos[0][1]
+        return None
+
+    def nao_resolvidos(self, bairros: pd.Series, ignorar=()) -> pd.DataFrame:
+        """Valores de uma coluna já normalizada que não estão no dicionário, com registros e sugestão."""
+        canonicos = set(self.bairros) | set(ignorar)
+        contagem = bairros.value_counts()
+        contagem = contagem[(contagem > 0) & ~contagem.index.isin(list(canonicos))]
+        return pd.DataFrame({
+            "Bairro": contagem.index.astype(str),
+            "Registros": contagem.to_numpy(dtype="int64"),
+            "Sugestão": [self.sugestao(str(valor)) for valor in contagem.index],
+        })
+
+
+def somar_nao_resolvidos(tabelas) -> pd.DataFrame:
+    """Junta relatórios de lotes diferentes (mesmo Bairro: soma os registros)."""
+    tabelas = [t for t in tabelas if len(t)]
+    if not tabelas:
+        return pd.DataFrame({"Bairro": pd.Series(dtype=str), "Registros": pd.Series(dtype="int64"),
+                             "Sugestão": pd.Series(dtype=object)})
+    juntas = pd.concat(tabelas, ignore_index=True)
+    return (
+        juntas.groupby("Bairro", sort=False, as_index=False)
+        .agg(Registros=("Registros", "sum"), Sugestão=("Sugestão", "last"))
+        .sort_values(["Registros", "Bairro"], ascending=[False, True], ignore_index=True)
+    )
+
+
+def ler(caminho=ARQUIVO_BAIRROS) -> Dicionario:
+    """Dicionário do arquivo; sem arquivo (ou ilegível), um dicionário vazio."""
+    try:
+        conteudo = Path(caminho).read_bytes()
+        dados = json.loads(conteudo)
+    except (OSError, ValueError):
+        return Dicionario()
+    if dados.get("formato") != FORMATO:
+        return Dicionario()
+    return Dicionario(dados.get("bairros", []), dados.get("variantes", {}),
+                      versao=hashlib.sha1(conteudo).hexdigest()[:12])
+
+
+_atuais = {}  # caminho -> (assinatura do arquivo, dicionário)
+_lock = threading.Lock()
+
+
+def dicionario(caminho=ARQUIVO_BAIRROS) -> Dicionario:
+    """Dicionário vigente (relido só quando o arquivo muda; o cache de resoluções vai junto)."""
+    try:
+        st = Path(caminho).stat()
+        assinatura = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        assinatura = None
+    with _lock:
+        atual = _atuais.get(str(caminho))
+        if atual is None or atual[0] != assinatura:
+            atual = _atuais[str(caminho)] = (assinatura, ler(caminho))
+        return atual[1]
+
+
+def main():
+    import bridge_data
+    import bridge_incremental
+
+    for ano, caminho in bridge_data.descobrir_anos().items():
+        carga = bridge_incremental.carregar(caminho, bridge_data.aba_consolidado(ano))
+        relatorio = carga["bairros_nao_resolvidos"]
+        print(f"{ano}: {len(relatorio)} bairro(s) fora do dicionário ({relatorio['Registros'].sum()} registros)")
+        if len(relatorio):
+            print(relatorio.to_string(index=False))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Cache LRU limitado para resultados derivados dos filtros do dashboard.
+
+Compartilhado entre as sessões do Streamlit (via `st.cache_resource`), por
+isso é protegido por lock e os valores guardados devem ser tratados como
+somente leitura. O limite é por número de itens e, opcionalmente, por memória
+(`max_mb`, com o tamanho de cada valor estimado na inserção, sem serializar).
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+ORCAMENTO_MB = float(os.environ.get("BRIDGE_ORCAMENTO_PAINEIS_MB", 128))
+# figura do Plotly: layout e template (~6–8 KB no pickle) mais cada ponto dos traços
+TAMANHO_FIGURA = 8 * 2**10
+TAMANHO_PONTO = 64
+_DADOS_TRACO = ("x", "y", "values", "labels", "text", "customdata")
+
+
+def _tamanho_figura(fig) -> int:
+    pontos = 0
+    for traco in fig.data:
+        for nome in _DADOS_TRACO:
+            dados = getattr(traco, nome, None)
+            if dados is not None and not isinstance(dados, str):
+                pontos += len(dados)
+    return TAMANHO_FIGURA + pontos * TAMANHO_PONTO
+
+
+def tamanho_bytes(valor) -> int:
+    """Estimativa barata do tamanho de um valor (painéis: dicts de tabelas e figuras).
+
+    Tabelas pelo `memory_usage(deep=True)`; figuras por uma parte fixa mais os
+    pontos dos traços. Não serializa nada: o custo não cresce com a figura.
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(uso, pd.Series) else uso)
+    if isinstance(valor, dict):
+        return sum(tamanho_bytes(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(tamanho_bytes(v) for v in valor)
+    if hasattr(valor, "to_plotly_json"):
+        return _tamanho_figura(valor)
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    def __init__(self, maxsize: int = 64, max_mb=None, tamanho=tamanho_bytes):
+        self.maxsize = maxsize
+        self.max_mb = max_mb
+        self._tamanho = tamanho
+        self._itens = OrderedDict()
+        self._bytes = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def obter(self, chave, construir):
+        """Retorna o valor de `chave`, construindo com `construir()` se não estiver no cache."""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return self._itens[chave]
+            self.misses += 1
+
+        # constrói fora do lock (duas sessões podem construir a mesma chave; vale a última)
+        valor = construir()
+        tamanho = self._tamanho(valor) if self.max_mb is not None else 0
+
+        with self._lock:
+            self._remover(chave)
+            self._itens[chave] = valor
+            self._bytes[chave] = tamanho
+            self._total += tamanho
+            # sempre mantém o item recém-construído, mesmo que sozinho passe do limite
+            while len(self._itens) > 1 and (
+                len(self._itens) > self.maxsize
+                or (self.max_mb is not None and self._total > self.max_mb * 2**20)
+            ):
+                self._remover(next(iter(self._itens)))
+                self.evictions += 1
+        return valor
+
+    def _remover(self, chave):
+        if chave in self._itens:
+            del self._itens[chave]
+            self._total -= self._bytes.pop(chave)
+
+    def descartar(self, predicado) -> int:
+        """Remove as chaves para as quais `predicado(chave)` é verdadeiro (ex.: versões antigas)."""
+        with self._lock:
+            velhas = [chave for chave in self._itens if predicado(chave)]
+            for chave in velhas:
+                self._remover(chave)
+            return len(velhas)
+
+    def stats(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "itens": len(self._itens),
+                "maxsize": self.maxsize,
+                "mb": self._total / 2**20,
+                "max_mb": self.max_mb,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,190 @@
+"""Cubo de agregados do consolidado BRIDGE.
+
+O cubo guarda, para cada combinação de (MesOrd, Decisão, Bairro, Faixa
+Etária, Conseguiu fazer contato?), a quantidade de registros e a soma/contagem
+das idades. É montado uma vez por versão dos dados; todas as métricas e
+gráficos do dashboard são roll-ups baratos dele, sem varrer as linhas brutas.
+"""
+import pandas as pd
+
+import bridge_tempos
+from bridge_data import FAIXAS_ETARIAS, NAO_INFORMADO, rotulo_mes
+
+DIMENSOES = ["MesOrd", "Decisão", "Bairro", "Faixa Etária", "Conseguiu fazer contato?"]
+
+
+@bridge_tempos.medido()
+def montar_cubo(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrupa as linhas normalizadas nas DIMENSOES (mantém grupos com valores ausentes)."""
+    cubo = (
+        df.groupby(DIMENSOES, observed=True, dropna=False)
+        .agg(Quantidade=("Idade", "size"), SomaIdade=("Idade", "sum"), QtdIdade=("Idade", "count"))
+        .astype("int64")
+        .reset_index()
+    )
+    return cubo
+
+
+def com_rotulo_mes(tabela: pd.DataFrame) -> pd.DataFrame:
+    """Troca MesOrd pelo rótulo "AAAA-MM" (coluna AnoMes), na mesma posição."""
+    tabela = tabela.sort_values("MesOrd", kind="stable")
+    tabela.insert(0, "AnoMes", rotulo_mes(tabela["MesOrd"]).to_numpy())
+    return tabela.drop(columns="MesOrd").reset_index(drop=True)
+
+
+def combinar(cubos) -> pd.DataFrame:
+    """Junta cubos de anos diferentes (partições) mantendo as dimensões como categorias."""
+    cubos = list(cubos)
+    if len(cubos) == 1:
+        return cubos[0]
+    cubo = pd.concat(cubos, ignore_index=True)
+    for dim in DIMENSOES[1:]:
+        if not isinstance(cubo[dim].dtype, pd.CategoricalDtype):
+            cubo[dim] = cubo[dim].astype("category")
+    return cubo
+
+
+def somar(cubos) -> pd.DataFrame:
+    """Soma cubos com as mesmas dimensões (ex.: cubo existente + cubo das linhas novas)."""
+    return (
+        combinar(cubos)
+        .groupby(DIMENSOES, observed=True, dropna=False)[["Quantidade", "SomaIdade", "QtdIdade"]]
+        .sum()
+        .reset_index()
+    )
+
+
+def filtrar(cubo: pd.DataFrame, decisoes=None) -> pd.DataFrame:
+    """Recorta o cubo pelas decisões selecionadas (vazio/None = todas)."""
+    if not decisoes:
+        return cubo
+    return cubo[cubo["Decisão"].isin(decisoes)]
+
+
+def periodo(cubo: pd.DataFrame, inicio=None, fim=None) -> pd.DataFrame:
+    """Recorta o cubo pelos meses ordinais de `inicio` a `fim` (None = sem limite; sem data fica fora)."""
+    if inicio is None and fim is None:
+        return cubo
+    meses = cubo["MesOrd"]
+    dentro = meses.notna()
+    if inicio is not None:
+        dentro &= meses >= inicio
+    if fim is not None:
+        dentro &= meses <= fim
+    return cubo[dentro.fillna(False)]
+
+
+def com_faixa(cubo: pd.DataFrame) -> pd.DataFrame:
+    """Apenas registros com data e idade dentro de alguma faixa etária."""
+    return cubo[cubo["Faixa Etária"].notna() & cubo["MesOrd"].notna()]
+
+
+def contagem(cubo: pd.DataFrame, dims) -> pd.DataFrame:
+    """Soma de Quantidade por `dims` (grupos vazios descartados)."""
+    return (
+        cubo.groupby(dims, observed=True)["Quantidade"]
+        .sum()
+        .loc[lambda s: s > 0]
+        .reset_index()
+    )
+
+
+def total(cubo: pd.DataFrame) -> int:
+    return int(cubo["Quantidade"].sum())
+
+
+def total_contato(cubo: pd.DataFrame, resposta: str = "Sim") -> int:
+    return int(cubo.loc[cubo["Conseguiu fazer contato?"] == resposta, "Quantidade"].sum())
+
+
+def media_idade(cubo: pd.DataFrame) -> float:
+    qtd = cubo["QtdIdade"].sum()
+    return float(cubo["SomaIdade"].sum() / qtd) if qtd else float("nan")
+
+
+def totais(cubo: pd.DataFrame) -> dict:
+    """Somas aditivas do cubo: registros, contatos "Sim" e soma/contagem das idades."""
+    return {
+        "Quantidade": total(cubo),
+        "ContatoSim": total_contato(cubo, "Sim"),
+        "SomaIdade": int(cubo["SomaIdade"].sum()),
+        "QtdIdade": int(cubo["QtdIdade"].sum()),
+    }
+
+
+def metricas(cubo: pd.DataFrame) -> dict:
+    """KPIs do topo do dashboard (percentual e média arredondados para inteiro)."""
+    return metricas_totais(totais(cubo))
+
+
+def metricas_totais(somas) -> dict:
+    """KPIs a partir das somas de `totais` (de um cubo ou de visões somadas)."""
+    total_decisoes = int(somas["Quantidade"])
+    total_contato_sucesso = int(somas["ContatoSim"])
+    media = somas["SomaIdade"] / somas["QtdIdade"] if somas["QtdIdade"] else float("nan")
+    return {
+        "total_decisoes": total_decisoes,
+        "total_contato_sucesso": total_contato_sucesso,
+        "percentual_contato_sucesso": round((total_contato_sucesso / total_decisoes) * 100) if total_decisoes > 0 else 0,
+        "media_idade": round(media) if not pd.isna(media) else 0,
+    }
+
+
+def ranking(cubo: pd.DataFrame, dim: str, n=None, excluir=NAO_INFORMADO) -> pd.DataFrame:
+    """Top `n` valores de `dim` por quantidade (empates em ordem alfabética)."""
+    base = cubo[cubo[dim] != excluir] if excluir is not None else cubo
+    return ordenar_ranking(contagem(base, dim), dim, n)
+
+
+def ordenar_ranking(tabela: pd.DataFrame, dim: str, n=None) -> pd.DataFrame:
+    """Ordena uma contagem por `dim` como em `ranking` e fica com as `n` primeiras."""
+    res = tabela.sort_values(
+        ["Quantidade", dim], ascending=[False, True],
+        key=lambda col: col.astype(str) if col.name == dim else col
+    )
+    res = res.head(n) if n is not None else res
+    return res.reset_index(drop=True)
+
+
+def serie_mensal(cubo: pd.DataFrame) -> pd.DataFrame:
+    return com_rotulo_mes(contagem(cubo, "MesOrd"))
+
+
+def pivot_contato(cubo: pd.DataFrame) -> pd.DataFrame:
+    """Quantidade por mês e resposta de contato, com coluna Total."""
+    pivot = (
+        com_rotulo_mes(contagem(cubo, ["MesOrd", "Conseguiu fazer contato?"]))
+        .pivot(index="AnoMes", columns="Conseguiu fazer contato?", values="Quantidade")
+        .fillna(0)
+        .astype(int)
+    )
+    for resposta in ("Sim", "Não"):
+        if resposta not in pivot.columns:
+            pivot[resposta] = 0
+    pivot.columns = pivot.columns.astype(str)
+    pivot["Total"] = pivot.sum(axis=1)
+    return pivot.reset_index()
+
+
+def dist_faixa(cubo: pd.DataFrame) -> pd.DataFrame:
+    """Quantidade e percentual por faixa etária (todas as faixas, na ordem original)."""
+    counts = contagem(com_faixa(cubo), "Faixa Etária").set_index("Faixa Etária")["Quantidade"]
+    dist = pd.DataFrame({"Faixa Etária": FAIXAS_ETARIAS})
+    dist["Quantidade"] = dist["Faixa Etária"].map(counts).fillna(0).astype(int)
+
+    total_nc = int(dist["Quantidade"].sum())
+    if total_nc == 0:
+        dist["Percentual"] = 0.0
+    else:
+        dist["Percentual"] = (dist["Quantidade"].astype(float) / float(total_nc) * 100).round(1)
+    return dist
+
+
+def bairro_faixa(cubo: pd.DataFrame, bairros, faixas) -> pd.DataFrame:
+    base = com_faixa(cubo)
+    base = base[base["Bairro"].isin(bairros) & base["Faixa Etária"].isin(faixas)]
+    return contagem(base, ["Bairro", "Faixa Etária"])
+
+
+def evolucao_faixa_mensal(cubo: pd.DataFrame) -> pd.DataFrame:
+    return com_rotulo_mes(contagem(com_faixa(cubo), ["MesOrd", "Faixa Etária"]))
@@ -0,0 +1,463 @@
+"""Camada de ingestão das planilhas do Ministério BRIDGE.
+
+Cada aba lida de um .xlsx é convertida em um snapshot colunar (DataFrame
+tipado, serializado em pickle) gravado ao lado da planilha de origem, na
+pasta `.snapshots/`. O snapshot é identificado por caminho + mtime + tamanho
++ hash do conteúdo e só é reconstruído quando a planilha muda de fato.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+
+import bridge_bairros
+import bridge_tempos
+
+PASTA_SNAPSHOTS = ".snapshots"
+PADRAO_CONSOLIDADO = re.compile(r"^Consolidado_Bridge_(\d{4})\.xlsx$")
+FORMATO_SNAPSHOT = 1
+NAO_INFORMADO = "Não informado"
+
+# Colunas do consolidado que o dashboard usa (Telefone vira a Chave); as demais
+# nem chegam a ser convertidas na leitura
+COLUNAS_CONSOLIDADO = ["Quando", "Decisão", "Bairro", "Idade", "Conseguiu fazer contato?", "Telefone"]
+LOTE_LEITURA = 10_000  # linhas por lote na leitura em streaming
+FORMATO_DATA = "%d/%m/%Y"  # Quando digitado na planilha
+IDADE_MAXIMA = 120
+
+# ===== FAIXAS AJUSTADAS =====
+FAIXAS_BINS = [0, 8, 12, 17, 26, 39, 49, 59, 100]
+FAIXAS_ETARIAS = [
+    "Kids (0–8)",
+    "Connect (9–12)",
+    "Nexteen (13–17)",
+    "Next (18–26)",
+    "Next 27+ (27–39)",
+    "40+ (40–49)",
+    "50+ (50–59)",
+    "60+ (60–100)"
+]
+
+
+def descobrir_anos(pasta=".") -> dict:
+    """Planilhas consolidadas disponíveis, por ano: {2026: Path(...), 2025: ...}."""
+    anos = {}
+    for caminho in Path(pasta).glob("Consolidado_Bridge_*.xlsx"):
+        m = PADRAO_CONSOLIDADO.match(caminho.name)
+        if m:
+            anos[int(m.group(1))] = caminho
+    return dict(sorted(anos.items(), reverse=True))
+
+
+def aba_consolidado(ano: int) -> str:
+    return f"{ano} Consolidado"
+
+
+def anos_padrao(anos: dict) -> list:
+    """Seleção padrão de anos: o mais recente com registros (ex.: não a planilha do
+    ano novo que só tem o cabeçalho). Nenhum com registros: o mais recente."""
+    for ano, caminho in anos.items():
+        try:
+            if len(ler_aba(caminho, aba_consolidado(ano), COLUNAS_CONSOLIDADO)):
+                return [ano]
+        except Exception:  # planilha ilegível: o vigia relata ao carregar
+            continue
+    return list(anos)[:1]
+
+
+def fingerprint(caminho) -> dict:
+    """Identificação barata do arquivo (sem ler o conteúdo)."""
+    caminho = Path(caminho)
+    st = caminho.stat()
+    return {
+        "caminho": str(caminho.resolve()),
+        "mtime_ns": st.st_mtime_ns,
+        "tamanho": st.st_size,
+    }
+
+
+def hash_conteudo(caminho, bloco: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def caminho_snapshot(caminho, aba=0, colunas=None) -> Path:
+    caminho = Path(caminho)
+    nome = f"{caminho.stem}__{aba}".replace(os.sep, "_")
+    if colunas is not None:
+        # uma seleção de colunas é outro snapshot (identificado por um hash curto da lista)
+        nome += "__" + hashlib.sha1("\x1f".join(colunas).encode("utf-8")).hexdigest()[:8]
+    return caminho.parent / PASTA_SNAPSHOTS / f"{nome}.pkl"
+
+
+def _ler_meta(caminho_meta: Path):
+    try:
+        with open(caminho_meta, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("formato") == FORMATO_SNAPSHOT else None
+
+
+def _gravar_atomico(destino: Path, dados: bytes):
+    # grava em arquivo temporário e troca de uma vez (nunca deixa snapshot pela metade)
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(dados)
+    os.replace(tmp, destino)
+
+
+def _snapshot_valido(caminho, aba, fp: dict, colunas=None):
+    """Retorna (meta, sha) — meta é None se o snapshot não corresponde mais à planilha.
+
+    `sha` é o hash do conteúdo quando precisou ser calculado, para não ler o
+    arquivo duas vezes.
+    """
+    snap = caminho_snapshot(caminho, aba, colunas)
+    meta = _ler_meta(snap.with_suffix(".json"))
+    colunas = list(colunas) if colunas is not None else None
+    if meta is None or meta["aba"] != str(aba) or meta.get("colunas") != colunas or not snap.exists():
+        return None, None
+    origem = meta["origem"]
+    if origem["mtime_ns"] == fp["mtime_ns"] and origem["tamanho"] == fp["tamanho"]:
+        return meta, origem["sha256"]
+    # mtime/tamanho mudaram (ex.: cópia, checkout): confirma pelo conteúdo
+    sha = hash_conteudo(caminho)
+    if sha != origem["sha256"]:
+        return None, sha
+    meta["origem"] = {**fp, "sha256": sha}
+    try:
+        _gravar_atomico(snap.with_suffix(".json"), json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass
+    return meta, sha
+
+
+def versao_aba(caminho, aba=0, colunas=None) -> str:
+    """Versão dos dados de uma aba (hash do conteúdo da planilha de origem)."""
+    _, sha = _snapshot_valido(caminho, aba, fingerprint(caminho), colunas)
+    return sha or hash_conteudo(caminho)
+
+
+def _lote_para_frame(linhas, colunas) -> pd.DataFrame:
+    """Um lote de linhas (tuplas) vira colunas tipadas.
+
+    Idade é numérica; Quando fica como veio (texto dd/mm/aaaa ou data do Excel,
+    interpretado em `preparar`); as demais viram texto (telefone digitado
+    como número inclusive).
+    """
+    valores = list(zip(*linhas)) if linhas else [()] * len(colunas)
+    frame = {}
+    for nome, coluna in zip(colunas, valores):
+        if nome == "Idade":
+            frame[nome] = pd.to_numeric(pd.Series(coluna, dtype=object), errors="coerce")
+        elif nome == "Quando":
+            frame[nome] = pd.Series(coluna, dtype=object)
+        else:
+            frame[nome] = pd.Series(coluna, dtype="str")
+    return pd.DataFrame(frame, columns=colunas)
+
+
+def ler_xlsx_colunas(caminho, aba=0, colunas=COLUNAS_CONSOLIDADO, lote: int = LOTE_LEITURA) -> pd.DataFrame:
+    """Lê só `colunas` de uma aba, em streaming (openpyxl somente leitura), lote a lote.
+
+    Não monta o modelo de objetos da planilha inteira: as linhas são lidas do
+    XML uma a uma, só as colunas pedidas são guardadas e cada lote de `lote`
+    linhas já vira colunas tipadas. Como no `pd.read_excel`, linhas vazias
+    no fim da aba são ignoradas.
+    """
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[aba] if isinstance(aba, int) else wb[aba]
+        linhas = ws.iter_rows(values_only=True)
+        cabecalho = list(next(linhas, ()))
+        faltando = [c for c in colunas if c not in cabecalho]
+        if faltando:
+            raise KeyError(f"colunas ausentes na aba {aba!r} de {Path(caminho).name}: {faltando}")
+        posicoes = [cabecalho.index(c) for c in colunas]
+
+        partes, atual, vazias = [], [], 0
+        for linha in linhas:
+            valores = tuple(linha[i] if i < len(linha) else None for i in posicoes)
+            if all(v is None for v in valores):
+                vazias += 1  # só entram se houver linha preenchida depois
+                continue
+            atual.extend([(None,) * len(colunas)] * vazias)
+            vazias = 0
+            atual.append(valores)
+            if len(atual) >= lote:
+                partes.append(_lote_para_frame(atual, colunas))
+                atual = []
+        if atual or not partes:
+            partes.append(_lote_para_frame(atual, colunas))
+    finally:
+        wb.close()
+    return pd.concat(partes, ignore_index=True)
+
+
+def ler_aba(caminho, aba=0, colunas=None) -> pd.DataFrame:
+    """Lê uma aba do .xlsx passando pelo snapshot colunar.
+
+    Usa o snapshot quando ele corresponde à planilha; caso contrário faz o
+    parse e regrava o snapshot. Com `colunas`, o parse é em streaming e só
+    dessas colunas (`ler_xlsx_colunas`); sem, é o `pd.read_excel` da aba
+    inteira. Falhas de escrita (ex.: disco somente leitura) não impedem a
+    leitura.
+    """
+    fp = fingerprint(caminho)
+    snap = caminho_snapshot(caminho, aba, colunas)
+    meta, sha = _snapshot_valido(caminho, aba, fp, colunas)
+    if meta is not None:
+        try:
+            with open(snap, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    sha = sha or hash_conteudo(caminho)
+    with bridge_tempos.secao("leitura_xlsx"):
+        if colunas is not None:
+            df = ler_xlsx_colunas(caminho, aba, colunas)
+        else:
+            df = pd.read_excel(caminho, sheet_name=aba)
+
+    meta = {"formato": FORMATO_SNAPSHOT, "aba": str(aba), "origem": {**fp, "sha256": sha}}
+    if colunas is not None:
+        meta["colunas"] = list(colunas)
+    try:
+        snap.parent.mkdir(exist_ok=True)
+        _gravar_atomico(snap, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+        _gravar_atomico(snap.with_suffix(".json"), json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass
+    return df
+
+
+def preparar_snapshot(caminho, aba=0, colunas=None) -> str:
+    """Garante que o snapshot da aba está atualizado (parse só se preciso); devolve a versão."""
+    meta, sha = _snapshot_valido(caminho, aba, fingerprint(caminho), colunas)
+    if meta is None:
+        ler_aba(caminho, aba, colunas)
+        _, sha = _snapshot_valido(caminho, aba, fingerprint(caminho), colunas)
+    return sha or hash_conteudo(caminho)
+
+
+def pre_carregar(tarefas: dict, processos: bool = False, max_workers=None) -> dict:
+    """Prepara os snapshots de várias abas em paralelo, em segundo plano.
+
+    `tarefas` é {chave: (caminho, aba)} ou {chave: (caminho, aba, colunas)};
+    devolve {chave: Future} com a versão
+    de cada aba. Com `processos=True` o parse do .xlsx (CPU, preso ao GIL no
+    openpyxl) roda em processos separados; o resultado volta pelo snapshot em
+    disco, não pelo pickle do DataFrame.
+    """
+    if not tarefas:
+        return {}
+    workers = max_workers or (min(len(tarefas), os.cpu_count() or 1) if processos else len(tarefas))
+    executor = (ProcessPoolExecutor if processos else ThreadPoolExecutor)(max_workers=workers)
+    futuros = {chave: executor.submit(preparar_snapshot, *tarefa) for chave, tarefa in tarefas.items()}
+    executor.shutdown(wait=False)
+    return futuros
+
+
+# ===============================
+# Normalização dos rótulos de texto
+# ===============================
+
+# Normalizar "Decisão" para evitar categorias duplicadas (case/acentos/espaços invisíveis)
+def _norm_text_label(s: str) -> str:
+    if s is None:
+        return ""
+    s = unicodedata.normalize("NFC", str(s))
+    s = (s
+         .replace("\u00A0", " ")   # NBSP
+         .replace("\u2007", " ")   # figure space
+         .replace("\u202F", " ")   # narrow NBSP
+         .replace("\u200b", ""))   # zero-width space
+    s = " ".join(s.split()).strip()
+
+    # padroniza para comparação (sem perder o "bonito" final)
+    key = s.casefold()
+
+    mapa = {
+        "aceitou jesus": "Aceitou Jesus",
+        "reconciliou com jesus": "Reconciliou com Jesus",
+        "pedido de oração": "Pedido de oração",
+        "pedido de oracao": "Pedido de oração",
+    }
+    return mapa.get(key, s)
+
+
+# Limpeza de dados — normalização global do Bairro (resolve duplicados como 'Copacabana' x 'Copacabana ')
+def _norm_unicode_spaces(s: str) -> str:
+    if s is None:
+        return ""
+    # normaliza forma Unicode (NFC), troca NBSP e espaços estreitos por espaço comum e colapsa múltiplos
+    s = unicodedata.normalize("NFC", str(s))
+    s = (s
+         .replace("\u00A0", " ")   # NBSP
+         .replace("\u2007", " ")   # figure space
+         .replace("\u202F", " "))  # narrow no-break space
+    s = " ".join(s.split())
+    return s.strip()
+
+
+def _norm_contato(s: str) -> str:
+    return {"sim": "Sim", "não": "Não", "nao": "Não"}.get(str(s).strip().lower(), NAO_INFORMADO)
+
+
+def _normalizar_coluna(serie: pd.Series, func) -> pd.Series:
+    """Aplica `func` uma vez por valor distinto e devolve a coluna como categoria.
+
+    Vazios, "--" e ausentes viram "Não informado".
+    """
+    mapa = {}
+    for valor in serie.dropna().unique():
+        rotulo = func(valor)
+        mapa[valor] = rotulo if rotulo not in ("", "--") else NAO_INFORMADO
+    return serie.map(mapa).fillna(NAO_INFORMADO).astype("category")
+
+
+@bridge_tempos.medido()
+def normalizar(df: pd.DataFrame, bairros=None) -> pd.DataFrame:
+    """Etapa única de normalização do consolidado (roda dentro da carga em cache).
+
+    `bairros` é o dicionário de bairros (padrão: o vigente, `bridge_bairros.dicionario()`).
+    """
+    df["Decisão"] = _normalizar_coluna(df["Decisão"], _norm_text_label)
+    # grafias do mesmo bairro (acento, caixa, erro de digitação) viram o nome canônico
+    if bairros is None:
+        bairros = bridge_bairros.dicionario()
+    df["Bairro"] = _normalizar_coluna(df["Bairro"], lambda s: bairros.canonico(_norm_unicode_spaces(s)))
+    df["Conseguiu fazer contato?"] = _normalizar_coluna(df["Conseguiu fazer contato?"], _norm_contato)
+    return df
+
+
+def normalizar_telefone(serie: pd.Series) -> pd.Series:
+    """Telefone como chave inteira compacta (DDD + número), vetorizado.
+
+    "21 99966-1825", "5521999661825" e 21999661825 viram 21999661825; celulares
+    antigos de 8 dígitos ganham o 9 (21 9628-9696 -> 21996289696). Valores com
+    menos de 8 dígitos ficam vazios.
+    """
+    digitos = serie.astype("string").str.replace(r"\.0$", "", regex=True).str.replace(r"\D", "", regex=True)
+    # código do país
+    digitos = digitos.where(~(digitos.str.len().isin([12, 13]) & digitos.str.startswith("55")), digitos.str[2:])
+    # DDD + celular de 8 dígitos (começa com 6–9): acrescenta o nono dígito
+    antigo = (digitos.str.len() == 10) & digitos.str[2].isin(list("6789"))
+    digitos = digitos.where(~antigo, digitos.str[:2] + "9" + digitos.str[2:])
+    digitos = digitos.where(digitos.str.len() >= 8)
+    return pd.to_numeric(digitos, errors="coerce").astype("Int64")
+
+
+def converter_datas(valores: pd.Series) -> pd.Series:
+    """Quando como datetime, vetorizado e sem adivinhar o formato a cada carga.
+
+    Texto é lido como dd/mm/aaaa (uma hora depois da data é ignorada) e, se não
+    casar, como ISO (aaaa-mm-dd); células de data do Excel já chegam como
+    datetime. O que não casar com nenhum formato fica NaT (ver `datas_invalidas`).
+    """
+    datas = pd.to_datetime(valores, format=FORMATO_DATA, exact=False, errors="coerce")
+    resto = datas.isna() & valores.notna()
+    if resto.any():
+        datas[resto] = pd.to_datetime(valores[resto].astype("string").str.strip(), format="ISO8601", errors="coerce")
+    return datas
+
+
+def data_mais_recente(datas):
+    """A maior de `datas`, sem contar NaT (ano sem registros); None se não sobra nenhuma."""
+    validas = [data for data in datas if pd.notna(data)]
+    return max(validas) if validas else None
+
+
+def periodo(ano_inicial: int, datas) -> str:
+    """Linha de período do painel: "Período: 01/01/<ano> até <data mais recente>"."""
+    ultima = data_mais_recente(datas)
+    if ultima is None:
+        return f"Período: 01/01/{ano_inicial} (sem registros)"
+    return f"Período: 01/01/{ano_inicial} até {ultima.strftime(FORMATO_DATA)}"
+
+
+def datas_invalidas(valores: pd.Series, datas: pd.Series) -> pd.DataFrame:
+    """Linhas com Quando preenchido que não viraram data: {"Linha" (número na planilha), "Quando"}."""
+    ruins = valores.notna().to_numpy() & datas.isna().to_numpy()  # por posição: `datas` pode ter outro índice
+    return pd.DataFrame({
+        "Linha": (valores.index[ruins] + 2).astype("int64"),  # linha 1 é o cabeçalho
+        "Quando": valores[ruins].astype("string").to_numpy(),
+    })
+
+
+def mes_ordinal(datas: pd.Series) -> pd.Series:
+    """Mês como inteiro (ano * 12 + mês - 1): ordena e agrupa sem strings."""
+    return (datas.dt.year * 12 + datas.dt.month - 1).astype("Int32")
+
+
+def ordinal_mes(rotulo: str) -> int:
+    """Mês ordinal de um rótulo "AAAA-MM" (o inverso de `rotulo_mes`)."""
+    ano, sep, mes = str(rotulo).partition("-")
+    if not (sep and ano.isdigit() and mes.isdigit() and 1 <= int(mes) <= 12):
+        raise ValueError(f"mês inválido: {rotulo!r} (use AAAA-MM)")
+    return int(ano) * 12 + int(mes) - 1
+
+
+_ROTULOS_MES = {}  # mês ordinal -> "AAAA-MM", compartilhado por todos os gráficos mensais
+
+
+def rotulo_mes(ordinais) -> pd.Series:
+    """Rótulo "AAAA-MM" de cada mês ordinal (formatado uma vez por mês distinto)."""
+    codigos, meses = pd.factorize(pd.Series(ordinais).astype("Int64"))
+    for mes in meses:
+        if mes not in _ROTULOS_MES:
+            _ROTULOS_MES[mes] = f"{mes // 12}-{mes % 12 + 1:02d}"
+    # código -1 (mês vazio) fica <NA>, como as outras colunas de texto vazias
+    rotulos = pd.Categorical.from_codes(codigos, [_ROTULOS_MES[mes] for mes in meses])
+    return pd.Series(rotulos).astype("string")
+
+
+@bridge_tempos.medido()
+def derivar_colunas(df: pd.DataFrame) -> pd.DataFrame:
+    """Idade, mês ordinal (MesOrd), faixa etária e chave do telefone, calculados uma vez na carga.
+
+    Idades fora de 0–120 ficam vazias (UInt8); idades fora das faixas ou
+    ausentes ficam com "Faixa Etária" vazia.
+    """
+    df["Chave"] = normalizar_telefone(df["Telefone"])
+    idade = pd.to_numeric(df["Idade"], errors="coerce")
+    df["Idade"] = idade.where(idade.between(0, IDADE_MAXIMA)).round().astype("UInt8")
+    df["MesOrd"] = mes_ordinal(df["Quando"])
+    df["Faixa Etária"] = pd.cut(
+        df["Idade"], bins=FAIXAS_BINS, labels=FAIXAS_ETARIAS, right=True, include_lowest=True
+    )
+    return df
+
+
+def preparar(df: pd.DataFrame, bairros=None) -> pd.DataFrame:
+    """Pipeline completo de uma aba do consolidado: datas, normalização e colunas derivadas."""
+    df["Quando"] = converter_datas(df["Quando"])
+    # Decisão, Bairro e contato normalizados uma vez por valor distinto (categorias)
+    df = normalizar(df, bairros)
+    # Idade, MesOrd, Faixa Etária e Chave
+    return derivar_colunas(df)
+
+
+def memoria_mb(obj) -> float:
+    """Memória (MB) de um DataFrame/Series ou de um dict/lista deles."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = obj.memory_usage(deep=True)
+        return float(uso.sum() if hasattr(uso, "sum") else uso) / 2**20
+    if isinstance(obj, dict):
+        return sum(memoria_mb(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(memoria_mb(v) for v in obj)
+    return 0.0
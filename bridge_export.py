@@ -0,0 +1,273 @@
+"""Exportação estática do dashboard BRIDGE (modo headless, sem Streamlit).
+
+Roda o mesmo pipeline do dashboard (carga incremental, cubo, visões por
+decisão, painéis de `bridge_figuras`) uma vez e grava um relatório HTML autocontido com os cartões
+de métricas, as tabelas e todas as figuras do Plotly. Com `--por-decisao`,
+grava também uma variante por valor de Decisão.
+
+Um manifesto (`manifesto.json`) guarda a versão das planilhas usadas; se
+nenhuma mudou desde a última exportação, nada é regerado. A maior parte dos
+acessos somente leitura pode então ser servida como arquivo estático.
+
+Uso (na raiz do repositório):
+    python bridge_export.py --saida relatorio/ [--anos 2026 2025] [--por-decisao] [--forcar]
+"""
+import argparse
+import html
+import json
+import re
+import sys
+import unicodedata
+from pathlib import Path
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import bridge_bairros
+import bridge_cubo
+import bridge_data
+import bridge_figuras
+import bridge_incremental
+import bridge_start
+import bridge_visoes
+
+FORMATO_MANIFESTO = 1
+
+CSS = """
+body { font-family: "Source Sans Pro", sans-serif; margin: 0 auto; max-width: 1200px; padding: 24px; color: #262730; }
+h1 { margin-bottom: 0; }
+.cards { display: flex; gap: 16px; flex-wrap: wrap; margin: 16px 0; }
+.card { flex: 1 1 200px; border: 1px solid #e6e6e6; border-radius: 8px; padding: 12px 16px; }
+.card .rotulo { font-size: 14px; color: #555; }
+.card .valor { font-size: 32px; }
+.grade { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+table { border-collapse: collapse; }
+th, td { border-bottom: 1px solid #e6e6e6; padding: 4px 12px; text-align: left; }
+nav a { margin-right: 12px; }
+"""
+
+
+def _slug(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", texto.lower()).strip("-")
+
+
+def _arquivos_por_decisao(decisoes) -> dict:
+    """{arquivo: decisão}; decisões com o mesmo slug (ou sem slug) ganham um sufixo e não se sobrescrevem."""
+    arquivos = {}
+    for decisao in sorted(decisoes):
+        base = f"decisao-{_slug(decisao) or 'sem-nome'}"
+        nome, n = f"{base}.html", 1
+        while nome in arquivos:
+            n += 1
+            nome = f"{base}-{n}.html"
+        arquivos[nome] = decisao
+    return arquivos
+
+
+def _cards(itens) -> str:
+    return '<div class="cards">' + "".join(
+        f'<div class="card"><div class="rotulo">{html.escape(rotulo)}</div>'
+        f'<div class="valor">{html.escape(str(valor))}</div></div>'
+        for rotulo, valor in itens
+    ) + "</div>"
+
+
+class _Relatorio:
+    """Monta o corpo do HTML; o plotly.js entra uma vez só, na primeira figura."""
+
+    def __init__(self):
+        self.partes = []
+        self._plotly_incluido = False
+
+    def add(self, trecho: str):
+        self.partes.append(trecho)
+
+    def figura(self, fig: go.Figure) -> str:
+        trecho = pio.to_html(
+            fig, full_html=False, include_plotlyjs=not self._plotly_incluido, config={"responsive": True}
+        )
+        self._plotly_incluido = True
+        return trecho
+
+    def add_figura(self, fig: go.Figure):
+        self.add(self.figura(fig))
+
+    def add_lado_a_lado(self, *figs):
+        self.add('<div class="grade">' + "".join(f"<div>{self.figura(f)}</div>" for f in figs) + "</div>")
+
+    def html(self, titulo: str) -> str:
+        return (
+            f'<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+            f"<title>{html.escape(titulo)}</title><style>{CSS}</style></head>"
+            f"<body>{''.join(self.partes)}</body></html>"
+        )
+
+
+def carregar_dados(anos) -> dict:
+    """Cubos, datas e índice do Start dos `anos` escolhidos (mesmo pipeline do dashboard)."""
+    disponiveis = bridge_data.descobrir_anos()
+    anos = sorted(anos or bridge_data.anos_padrao(disponiveis))
+    faltando = [ano for ano in anos if ano not in disponiveis]
+    if faltando:
+        raise SystemExit(f"planilha não encontrada para: {', '.join(map(str, faltando))}")
+
+    participantes_start = bridge_data.ler_aba(bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START)
+    indice_start = bridge_start.montar_indice([
+        participantes_start,
+        bridge_data.ler_aba(bridge_start.ARQUIVO_ANALISE_START, "Start", bridge_start.COLUNAS_START),
+    ])
+    cubos_por_ano, cubos_start, datas, decisoes = {}, {}, [], {}
+    for ano in anos:
+        carga = bridge_incremental.carregar(disponiveis[ano], bridge_data.aba_consolidado(ano))
+        cubos_por_ano[ano] = carga["cubo"]
+        cubos_start[ano] = bridge_cubo.montar_cubo(bridge_start.participantes(carga["df"], indice_start))
+        datas.append(carga["df"]["Quando"].max())
+        decisoes.update(dict.fromkeys(carga["df"]["Decisão"].unique().tolist()))
+    visoes_por_ano = bridge_visoes.materializar({ano: (cubos_por_ano[ano], cubos_start[ano]) for ano in anos})
+    return {
+        "anos": anos,
+        "visoes_por_ano": visoes_por_ano,
+        "visoes": bridge_visoes.combinar(visoes_por_ano.values()),
+        "cubo": bridge_cubo.combinar(cubos_por_ano.values()),
+        "total_start": len(participantes_start),  # linhas de Paricipantes_Start.xlsx
+        "data_max": bridge_data.data_mais_recente(datas),
+        "decisoes": list(decisoes),
+    }
+
+
+def versoes(anos) -> dict:
+    """Versão (hash) de cada planilha usada no relatório e do dicionário de bairros."""
+    disponiveis = bridge_data.descobrir_anos()
+    res = {str(ano): bridge_data.versao_aba(disponiveis[ano], bridge_data.aba_consolidado(ano),
+                                            bridge_data.COLUNAS_CONSOLIDADO)
+           for ano in anos if ano in disponiveis}
+    res["start"] = bridge_data.versao_aba(bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START)
+    res["analise_start"] = bridge_data.versao_aba(bridge_start.ARQUIVO_ANALISE_START, "Start", bridge_start.COLUNAS_START)
+    res["bairros"] = bridge_bairros.dicionario().versao
+    return res
+
+
+def renderizar(dados: dict, decisao=None, navegacao="") -> str:
+    """HTML de uma variante do relatório (todas as decisões ou só `decisao`)."""
+    decisoes = [decisao] if decisao else []
+    cubo = dados["cubo"]
+    anos = dados["anos"]
+    titulo_anos = " / ".join(str(ano) for ano in anos)
+
+    p_decisoes = bridge_figuras.painel_decisoes(dados["visoes"], decisoes)
+    p_geral = bridge_figuras.painel_geral(cubo)
+    p_contato = bridge_figuras.painel_contato(cubo)
+    p_faixas = bridge_figuras.painel_faixas(cubo)
+    p_bairro_faixa = bridge_figuras.painel_bairro_faixa(cubo, p_faixas["faixas_por_qtd"][:5])
+    p_evolucao_faixa = bridge_figuras.painel_evolucao_faixa(cubo, p_faixas["faixas_total_periodo"][:5])
+    p_start = bridge_figuras.painel_start(dados["visoes"], dados["total_start"], decisoes)
+
+    r = _Relatorio()
+    r.add(f"<h1>Dashboard Ministério BRIDGE - {titulo_anos}</h1>")
+    periodo = bridge_data.periodo(anos[0], [dados["data_max"]])
+    r.add(f"<h3>{html.escape(periodo)}{' · Decisão: ' + html.escape(decisao) if decisao else ''}</h3>")
+    if navegacao:
+        r.add(navegacao)
+    r.add("<hr>")
+
+    m = p_decisoes["metricas"]
+    r.add(_cards([
+        ("📝 Total de Decisões", m["total_decisoes"]),
+        ("📞 Contatos Bem-Sucedidos", m["total_contato_sucesso"]),
+        ("📊 % Contatos", f"{m['percentual_contato_sucesso']}%"),
+        ("🎂 Média de Idade", f"{m['media_idade']} anos"),
+    ]))
+    r.add("<h2>🏙️ Top 5 Bairros com Mais Decisões</h2>" + p_decisoes["top_bairros"].to_html())
+    f = p_decisoes["figuras"]
+    r.add_lado_a_lado(f["pizza_qtd"], f["pizza_pct"])
+    r.add_figura(f["bairros_barra"])
+    r.add_figura(f["bairros_pizza"])
+
+    r.add("<h2>🚀 Evolução Mensal de Novos Começos</h2>")
+    r.add_figura(p_geral["figuras"]["novos_comecos_mensal"])
+    r.add("<h2>🙌 Evolução Mensal de Decisões: Aceitou Jesus</h2>")
+    r.add_figura(f["aceitou_mensal"])
+    r.add("<h2>📞 Evolução Mensal de Contatos Bem-Sucedidos</h2>")
+    r.add_figura(p_contato["figuras"]["contato_qtd"])
+    r.add_figura(p_contato["figuras"]["contato_pct"])
+
+    if len(anos) > 1:
+        p_comparativo = bridge_figuras.painel_comparativo(dados["visoes_por_ano"], decisoes)
+        r.add("<hr><h2>📅 Comparativo entre Anos</h2>" + p_comparativo["resumo"].to_html())
+        r.add_figura(p_comparativo["figuras"]["comparativo_mensal"])
+
+    r.add("<hr><h2>👥 Análise de Novos Começos por Faixa Etária</h2>")
+    r.add("<h3>🎂 Distribuição por Faixa Etária (Total de Novos Começos)</h3>")
+    r.add_lado_a_lado(p_faixas["figuras"]["faixa_total"], p_faixas["figuras"]["faixa_pct"])
+    r.add("<h3>🏙️ Distribuição por Bairros (Top 10) — Por Faixa Etária</h3>")
+    r.add_figura(p_bairro_faixa["figuras"]["bairro_stack"])
+    r.add("<h3>📈 Evolução Mensal de Novos Começos — Por Faixa Etária</h3>")
+    r.add_figura(p_evolucao_faixa["figuras"]["evo_linhas"])
+
+    ms = p_start["metricas"]
+    r.add("<hr><h2>📊 Análise dos Participantes do Start x Contatos Bridge</h2>")
+    r.add(_cards([
+        ("🎓 Total de Participantes do Start", ms["total_participantes_start_geral"]),
+        ("📊 % Contatados pelo Bridge que fizeram o Start", f"{ms['percentual_participantes_start']}%"),
+        ("📞 Contatados pelo Bridge", ms["total_contato_sucesso_start"]),
+        ("📊 % Contatados pelo Bridge x Total de Participantes do Start", f"{ms['percentual_contato_sucesso_start']}%"),
+    ]))
+    for chave in ("start_bairros", "start_pizza", "funil"):
+        r.add_figura(p_start["figuras"][chave])
+
+    return r.html(f"Dashboard Ministério BRIDGE - {titulo_anos}")
+
+
+def exportar(saida, anos=None, por_decisao=False, forcar=False) -> list:
+    """Grava o relatório em `saida` se as planilhas mudaram; devolve os arquivos gravados."""
+    saida = Path(saida)
+    anos = sorted(anos or bridge_data.anos_padrao(bridge_data.descobrir_anos()))
+    manifesto = {"formato": FORMATO_MANIFESTO, "anos": anos, "por_decisao": por_decisao, "versoes": versoes(anos)}
+    caminho_manifesto = saida / "manifesto.json"
+    if not forcar and caminho_manifesto.exists():
+        try:
+            if json.loads(caminho_manifesto.read_text(encoding="utf-8")) == manifesto:
+                return []
+        except (OSError, ValueError):
+            pass
+
+    dados = carregar_dados(anos)
+    variantes = {"index.html": None}
+    if por_decisao:
+        variantes.update(_arquivos_por_decisao(dados["decisoes"]))
+    navegacao = ""
+    if len(variantes) > 1:
+        navegacao = "<nav>" + "".join(
+            f'<a href="{nome}">{html.escape(d or "Todas as decisões")}</a>' for nome, d in variantes.items()
+        ) + "</nav>"
+
+    saida.mkdir(parents=True, exist_ok=True)
+    gravados = []
+    for nome, decisao in variantes.items():
+        bridge_data._gravar_atomico(saida / nome, renderizar(dados, decisao, navegacao).encode("utf-8"))
+        gravados.append(saida / nome)
+    # manifesto por último: uma exportação interrompida é refeita na próxima vez
+    bridge_data._gravar_atomico(caminho_manifesto, json.dumps(manifesto, indent=2).encode("utf-8"))
+    return gravados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saida", type=Path, default=Path("relatorio"))
+    parser.add_argument("--anos", type=int, nargs="+", help="padrão: o ano mais recente com registros")
+    parser.add_argument("--por-decisao", action="store_true", help="grava também uma página por Decisão")
+    parser.add_argument("--forcar", action="store_true", help="regera mesmo sem mudança nas planilhas")
+    args = parser.parse_args()
+
+    gravados = exportar(args.saida, args.anos, args.por_decisao, args.forcar)
+    if not gravados:
+        print("planilhas sem mudança desde a última exportação; nada a fazer")
+        return 0
+    for caminho in gravados:
+        print(caminho)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
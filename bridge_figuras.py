@@ -0,0 +1,518 @@
+"""Figuras (Plotly) e painéis do dashboard BRIDGE.
+
+Cada `fig_*` monta um gráfico a partir de uma tabela já agregada. Cada
+`painel_*` reúne as métricas, tabelas e figuras de uma seção do dashboard a
+partir do cubo ou, nas seções com filtro de Decisão, das visões por decisão
+(`bridge_visoes`) — é o que fica guardado no cache de filtros, por versão dos
+dados e filtros, e é apenas lido pelo script do Streamlit.
+
+As figuras ficam guardadas como objetos `go.Figure` já validados, e não como
+dicts: um dict passado ao `st.plotly_chart` é revalidado pelo Plotly a cada
+execução (~20 ms por gráfico), enquanto a figura pronta só é serializada
+(~2 ms). Elas são compartilhadas entre sessões: não devem ser alteradas.
+"""
+import pandas as pd
+
+import bridge_cubo
+import bridge_tempos
+import bridge_visoes
+
+# rótulos mais curtos só para a LEGENDA (sem mexer nos dados)
+LEGENDA_FAIXAS = {
+    "Next 27+ (27–39)": "Next 27+",
+    "Next (18–26)": "Next 18–26",
+    "Nexteen (13–17)": "Nexteen",
+    "Connect (9–12)": "Connect",
+    "Kids (0–8)": "Kids",
+    "40+ (40–49)": "40+",
+    "50+ (50–59)": "50+",
+    "60+ (60–100)": "60+",
+}
+
+
+def _px():
+    # plotly.express só é importado no primeiro gráfico, não na partida do
+    # processo: os KPIs do topo aparecem sem esperar por ele
+    import plotly.express as px
+    return px
+
+
+MESES_ABREV = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+
+
+def _eixo_meses(meses):
+    return dict(tickmode='array', tickvals=meses, ticktext=meses, tickangle=-45)
+
+
+def _legenda_curta(fig):
+    fig.for_each_trace(
+        lambda t: t.update(
+            name=LEGENDA_FAIXAS.get(t.name, t.name),
+            legendgroup=LEGENDA_FAIXAS.get(t.name, t.name)
+        )
+    )
+
+
+# ===============================
+# Decisões (respeitam o filtro da sidebar)
+# ===============================
+
+def fig_barras_rotuladas(tabela, categoria, valor, limiar, deslocamento, formato="{}", horizontal=False,
+                         texto=None, **kwargs):
+    """Barras com o valor escrito dentro e, nas pequenas (0 < valor < limiar), fora.
+
+    A posição de todos os rótulos é decidida de uma vez sobre a coluna `valor`
+    e as anotações externas entram numa única atualização do layout (um
+    `add_annotation` por barra revalida e copia o layout a cada chamada).
+
+    `texto` é a coluna com o texto interno; se não existir em `tabela`, é
+    criada com o valor formatado só para as barras >= limiar (as pequenas
+    ficam apenas com o rótulo externo). Os demais argumentos vão para `px.bar`.
+    """
+    valores = tabela[valor]
+    if texto is not None and texto not in tabela.columns:
+        grandes = valores >= limiar
+        tabela = tabela.assign(**{texto: valores[grandes].map(formato.format).reindex(tabela.index, fill_value="")})
+
+    eixos = dict(x=valor, y=categoria, orientation="h") if horizontal else dict(x=categoria, y=valor)
+    fig = _px().bar(tabela, text=texto, **eixos, **kwargs)
+    fig.update_traces(textposition="inside", insidetextanchor="middle", cliponaxis=False)
+
+    pequenas = tabela[(valores > 0) & (valores < limiar)]
+    posicoes = pequenas[valor] + deslocamento
+    rotulos = pequenas[valor].map(formato.format)
+    if horizontal:
+        anotacoes = [dict(x=p, y=c, text=r, xanchor="left", yanchor="middle")
+                     for p, c, r in zip(posicoes, pequenas[categoria], rotulos)]
+    else:
+        anotacoes = [dict(x=c, y=p, text=r, xanchor="center", yanchor="bottom")
+                     for p, c, r in zip(posicoes, pequenas[categoria], rotulos)]
+    fig.update_layout(
+        annotations=[dict(a, showarrow=False, font=dict(size=11)) for a in anotacoes],
+        uniformtext_minsize=10,
+        uniformtext_mode="hide"
+    )
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_pizza_decisoes_qtd(decisoes_count):
+    fig = _px().pie(
+        decisoes_count,
+        names="Tipo de Decisão",
+        values="Quantidade",
+        title="📊 Distribuição das Decisões (Quantidade)",
+        color_discrete_sequence=_px().colors.sequential.PuBu  # tons de azul suaves
+    )
+    fig.update_traces(textinfo='label+value')
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_pizza_decisoes_pct(decisoes_count):
+    fig = _px().pie(
+        decisoes_count,
+        names="Tipo de Decisão",
+        values="Quantidade",
+        title="📊 Distribuição das Decisões (Percentual)",
+        color_discrete_sequence=_px().colors.sequential.Blues  # tons de azul mais fortes
+    )
+    fig.update_traces(textinfo='label+percent')
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_bairros_barra(bairro_count):
+    fig = _px().bar(bairro_count, x="Bairro", y="Quantidade", title="📍 Distribuição das Decisões por Bairro",
+                 color_discrete_sequence=["#2297EF"], text="Quantidade")
+    fig.update_traces(textposition='inside')
+    fig.update_layout(height=int((fig.layout.height or 400) * 1.05))
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_bairros_pizza(bairro_count):
+    fig = _px().pie(bairro_count, names="Bairro", values="Quantidade",
+                 title="📊 Percentual das Decisões por Bairro",
+                 color_discrete_sequence=_px().colors.sequential.Blues)
+    fig.update_traces(textinfo='percent+label')
+    fig.update_layout(height=int((fig.layout.height or 400) * 1.05))
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_aceitou_mensal(aceitou_mensal):
+    fig = _px().line(
+        aceitou_mensal,
+        x="AnoMes",
+        y="Quantidade",
+        title="📈 Aceitaram Jesus por Mês",
+        markers=True,
+        line_shape="spline",
+        text="Quantidade",
+        labels={"AnoMes": "Mês", "Quantidade": "Aceitaram Jesus"},
+        color_discrete_sequence=["#1B77D3"]
+    )
+    fig.update_traces(textposition="top center", texttemplate="%{y}")
+    fig.update_layout(xaxis=_eixo_meses(aceitou_mensal["AnoMes"]))
+    return fig
+
+
+# ===============================
+# Visão geral (sem filtro)
+# ===============================
+
+@bridge_tempos.medido()
+def fig_novos_comecos_mensal(novos_comecos_mensal):
+    fig = _px().line(novos_comecos_mensal, x="AnoMes", y="Quantidade",
+                  title="📈 Novos Começos por Mês",
+                  markers=True, line_shape='spline', text="Quantidade",
+                  labels={"AnoMes": "Mês", "Quantidade": "Novos Começos"},
+                  color_discrete_sequence=["#2297EF"])
+    fig.update_traces(textposition="top center", texttemplate="%{y}")
+    fig.update_layout(xaxis=_eixo_meses(novos_comecos_mensal["AnoMes"]))
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_contato_qtd(pivot_qtd):
+    fig = _px().bar(
+        pivot_qtd,
+        x="AnoMes",
+        y=["Sim", "Não"],
+        title="📊 Contatos por Mês - Quantidade",
+        labels={"value": "Quantidade", "AnoMes": "Mês", "variable": "Contato"},
+        barmode="group",
+        color_discrete_map={"Sim": "#2297EF", "Não": "#08519C"},
+        text_auto=True
+    )
+    fig.update_traces(textposition="inside")
+    fig.update_layout(xaxis=_eixo_meses(pivot_qtd["AnoMes"]))
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_contato_pct(pivot_qtd):
+    # Calcular percentuais
+    pivot_pct = pivot_qtd.copy()
+    pivot_pct["Sim %"] = (pivot_pct["Sim"] / pivot_pct["Total"] * 100).round(1)
+    pivot_pct["Não %"] = (pivot_pct["Não"] / pivot_pct["Total"] * 100).round(1)
+
+    fig = _px().bar(
+        pivot_pct,
+        x="AnoMes",
+        y=["Sim %", "Não %"],
+        title="📊 Contatos por Mês - Percentual",
+        labels={"value": "Percentual (%)", "AnoMes": "Mês", "variable": "Contato"},
+        barmode="group",
+        color_discrete_map={"Sim %": "#2297EF", "Não %": "#08519C"},
+        text_auto=True
+    )
+    fig.update_layout(
+        xaxis=_eixo_meses(pivot_pct["AnoMes"]),
+        yaxis=dict(ticksuffix='%')
+    )
+    return fig
+
+
+# ===============================
+# Faixas etárias
+# ===============================
+
+@bridge_tempos.medido()
+def fig_faixa_total(dist_faixa):
+    # 👉 Ordenar da maior para a menor (esquerda -> direita)
+    dist_faixa_ord_qtd = dist_faixa.sort_values("Quantidade", ascending=False).reset_index(drop=True)
+    ordem_categorias_qtd = dist_faixa_ord_qtd["Faixa Etária"].tolist()
+
+    limiar_qtd = 15
+    fig = fig_barras_rotuladas(
+        dist_faixa_ord_qtd, "Faixa Etária", "Quantidade",
+        limiar=limiar_qtd,
+        deslocamento=max(1, int(limiar_qtd * 0.15)),
+        texto="Quantidade",
+        title="🏷️ Novos Começos por Faixa Etária (Quantidade)",
+        category_orders={"Faixa Etária": ordem_categorias_qtd},
+        color_discrete_sequence=["#2297EF"]
+    )
+    fig.update_layout(xaxis_tickangle=-15, yaxis_title="Quantidade")
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_faixa_pct(dist_faixa):
+    # 👉 Participação por faixa (%) — barras HORIZONTAIS com lógica híbrida (texto dentro p/ grandes, fora p/ pequenas)
+    dist_faixa_ord_pct = dist_faixa.sort_values("Percentual", ascending=False).reset_index(drop=True)
+
+    limiar_pct = 4.0  # ajuste fino do que é “pequeno” para seu layout
+    max_pct = float(dist_faixa_ord_pct["Percentual"].max() if not dist_faixa_ord_pct.empty else 0)
+    fig = fig_barras_rotuladas(
+        dist_faixa_ord_pct, "Faixa Etária", "Percentual",
+        limiar=limiar_pct,
+        deslocamento=max(0.6, max_pct * 0.02),
+        formato="{:.1f}%",
+        horizontal=True,
+        texto="TextoPercentual",
+        title="📊 Participação por Faixa (%)",
+        color_discrete_sequence=["#2297EF"]
+    )
+    # range maior para caber as anotações externas
+    fig.update_layout(
+        xaxis=dict(title="Percentual (%)", ticksuffix="%", range=[0, max(10, max_pct + 6)]),
+        yaxis=dict(categoryorder="total ascending"),
+        margin=dict(l=110, r=10, t=60, b=40),
+    )
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_bairro_stack(bairro_faixa, bairro_order, faixas_escolhidas):
+    fig = _px().bar(
+        bairro_faixa,
+        x="Bairro",
+        y="Quantidade",
+        color="Faixa Etária",
+        category_orders={"Bairro": bairro_order, "Faixa Etária": faixas_escolhidas},
+        barmode="stack",
+        text="Quantidade",
+        title="📍 Top 10 Bairros — Novos Começos Por Faixa Etária"
+    )
+    _legenda_curta(fig)
+    fig.update_traces(textposition="inside", cliponaxis=False)
+
+    # legenda otimizada para mobile: horizontal, multi-linha, abaixo do gráfico
+    fig.update_layout(
+        xaxis_tickangle=-30,
+        yaxis_title="Quantidade",
+        legend=dict(
+            orientation="h",
+            title_text="Faixa",
+            yanchor="top", y=-0.22,   # abaixo do chart
+            xanchor="left", x=0,
+            font=dict(size=11),
+            itemsizing="trace",
+            itemwidth=70,             # ajuda a quebrar em mais linhas em telas estreitas
+            tracegroupgap=8
+        ),
+        margin=dict(t=90, b=110)      # espaço para a legenda embaixo
+    )
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_evo_linhas(evo_filtrado, faixas_evo_escolhidas):
+    # Ordem cronológica do eixo X
+    meses_ordem = sorted(evo_filtrado["AnoMes"].unique().tolist())
+
+    fig = _px().line(
+        evo_filtrado,
+        x="AnoMes",
+        y="Quantidade",
+        color="Faixa Etária",
+        category_orders={"Faixa Etária": faixas_evo_escolhidas, "AnoMes": meses_ordem},
+        markers=True,
+        title="⏱️ Novos Começos por Mês e por Faixa Etária"
+    )
+    _legenda_curta(fig)
+    fig.update_traces(mode="lines+markers", line=dict(width=2))
+    fig.update_layout(
+        xaxis=dict(
+            tickangle=-45,
+            tickmode="array",
+            tickvals=meses_ordem,
+            ticktext=meses_ordem
+        ),
+        yaxis_title="Quantidade",
+        legend=dict(
+            orientation="h",
+            title_text="Faixa",
+            yanchor="top", y=-0.25,   # posiciona abaixo
+            xanchor="left", x=0,
+            font=dict(size=11),
+            itemsizing="trace",
+            itemwidth=70,             # ajuda a quebrar linhas
+            tracegroupgap=8
+        ),
+        margin=dict(t=90, b=120),     # espaço extra para legenda embaixo
+        hovermode="x unified"
+    )
+    return fig
+
+
+# ===============================
+# Comparativo entre anos
+# ===============================
+
+@bridge_tempos.medido()
+def fig_comparativo_mensal(comparativo):
+    fig = _px().line(
+        comparativo,
+        x="Mês",
+        y="Quantidade",
+        color="Ano",
+        markers=True,
+        text="Quantidade",
+        title="📅 Novos Começos por Mês — Comparativo entre Anos",
+        color_discrete_sequence=["#08519C", "#2297EF", "#6BAED6", "#9ECAE1"]
+    )
+    fig.update_traces(textposition="top center", texttemplate="%{y}")
+    fig.update_layout(
+        xaxis=dict(tickmode="array", tickvals=list(range(1, 13)), ticktext=MESES_ABREV),
+        yaxis_title="Quantidade",
+        hovermode="x unified"
+    )
+    return fig
+
+
+# ===============================
+# Start
+# ===============================
+
+@bridge_tempos.medido()
+def fig_start_bairros(top_bairros_start):
+    fig = _px().bar(top_bairros_start, x="Bairro", y="Quantidade", title="📍 Participantes do Start contatados pelo Bridge por Bairro",
+                 color_discrete_sequence=["#2297EF"], text="Quantidade")
+    fig.update_traces(textposition='outside')
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_start_pizza(top_bairros_start):
+    fig = _px().pie(top_bairros_start, names="Bairro", values="Quantidade",
+                 title="📊 Percentual de Participantes do Start contatados pelo Bridge por Bairro",
+                 color_discrete_sequence=_px().colors.sequential.Blues)
+    fig.update_traces(textinfo='percent+label')
+    return fig
+
+
+@bridge_tempos.medido()
+def fig_funil_start(total_contato_sucesso, total_contato_sucesso_start):
+    # Gráfico de funil - Contatos bem-sucedidos vs. Participantes do Start
+    return _px().funnel(pd.DataFrame({
+        "Categoria": ["Total Contatos Sucesso", "Participantes do Start Contato Sucesso"],
+        "Quantidade": [total_contato_sucesso, total_contato_sucesso_start]
+    }), x="Quantidade", y="Categoria", title="📉 Contatos Sucesso vs. Start")
+
+
+# ===============================
+# Painéis (o que vai para o cache de filtros)
+# ===============================
+
+@bridge_tempos.medido()
+def painel_decisoes(visoes, decisoes) -> dict:
+    """KPIs, Top 5 bairros e gráficos que dependem do filtro de Decisão (somando as visões)."""
+    v = bridge_visoes.compor(visoes, decisoes)
+
+    top_bairros = bridge_visoes.ranking(v, "bairro", 5)
+    top_bairros.index = top_bairros.index + 1
+
+    decisoes_count = bridge_visoes.ranking(v, "decisao", excluir=None)
+    decisoes_count.columns = ["Tipo de Decisão", "Quantidade"]
+    bairro_count = bridge_visoes.ranking(v, "bairro", 10)
+    aceitou_mensal = bridge_visoes.aceitou_mensal(visoes, decisoes)
+
+    return {
+        "metricas": bridge_visoes.metricas(v),
+        "top_bairros": top_bairros,
+        "figuras": {
+            "pizza_qtd": fig_pizza_decisoes_qtd(decisoes_count),
+            "pizza_pct": fig_pizza_decisoes_pct(decisoes_count),
+            "bairros_barra": fig_bairros_barra(bairro_count),
+            "bairros_pizza": fig_bairros_pizza(bairro_count),
+            "aceitou_mensal": fig_aceitou_mensal(aceitou_mensal),
+        },
+    }
+
+
+@bridge_tempos.medido()
+def painel_geral(cubo) -> dict:
+    """Evolução mensal de novos começos (sem filtro)."""
+    return {"figuras": {"novos_comecos_mensal": fig_novos_comecos_mensal(bridge_cubo.serie_mensal(cubo))}}
+
+
+@bridge_tempos.medido()
+def painel_contato(cubo) -> dict:
+    """Contatos por mês (pivot Sim/Não), em quantidade e percentual."""
+    pivot_qtd = bridge_cubo.pivot_contato(cubo)
+    return {"figuras": {"contato_qtd": fig_contato_qtd(pivot_qtd), "contato_pct": fig_contato_pct(pivot_qtd)}}
+
+
+@bridge_tempos.medido()
+def painel_faixas(cubo) -> dict:
+    """Distribuição por faixa etária e a ordem padrão dos seletores de faixa."""
+    cubo_nc = bridge_cubo.com_faixa(cubo)
+    dist_faixa = bridge_cubo.dist_faixa(cubo_nc)
+    evolucao = bridge_cubo.evolucao_faixa_mensal(cubo_nc)
+
+    return {
+        # padrões dos seletores de faixa: Top por quantidade total no período
+        "faixas_por_qtd": dist_faixa.sort_values("Quantidade", ascending=False)["Faixa Etária"].tolist(),
+        "faixas_total_periodo": (
+            evolucao.groupby("Faixa Etária", observed=True)["Quantidade"].sum().sort_values(ascending=False).index.tolist()
+        ),
+        "figuras": {
+            "faixa_total": fig_faixa_total(dist_faixa),
+            "faixa_pct": fig_faixa_pct(dist_faixa),
+        },
+    }
+
+
+@bridge_tempos.medido()
+def painel_bairro_faixa(cubo, faixas_escolhidas) -> dict:
+    cubo_nc = bridge_cubo.com_faixa(cubo)
+    # Top 10 bairros por total de novos começos (ordem do eixo X)
+    top_bairros_nc = bridge_cubo.ranking(cubo_nc, "Bairro", 10)
+    bairro_order = top_bairros_nc["Bairro"].tolist()
+    bairro_faixa = bridge_cubo.bairro_faixa(cubo_nc, bairro_order, faixas_escolhidas)
+    return {"figuras": {"bairro_stack": fig_bairro_stack(bairro_faixa, bairro_order, list(faixas_escolhidas))}}
+
+
+@bridge_tempos.medido()
+def painel_evolucao_faixa(cubo, faixas_evo_escolhidas) -> dict:
+    evolucao = bridge_cubo.evolucao_faixa_mensal(bridge_cubo.com_faixa(cubo))
+    evo_filtrado = evolucao[evolucao["Faixa Etária"].isin(faixas_evo_escolhidas)]
+    return {"figuras": {"evo_linhas": fig_evo_linhas(evo_filtrado, list(faixas_evo_escolhidas))}}
+
+
+@bridge_tempos.medido()
+def painel_comparativo(visoes_por_ano: dict, decisoes) -> dict:
+    """Comparativo ano a ano a partir das visões de cada ano (sem juntar as linhas)."""
+    return {
+        "resumo": bridge_visoes.resumo_anual(visoes_por_ano, decisoes).set_index("Ano"),
+        "figuras": {
+            "comparativo_mensal": fig_comparativo_mensal(bridge_visoes.comparativo_mensal(visoes_por_ano, decisoes)),
+        },
+    }
+
+
+@bridge_tempos.medido()
+def painel_start(visoes, total_participantes_start_geral: int, decisoes) -> dict:
+    """Métricas e gráficos do Start a partir das visões (parte cruzada com o Start)."""
+    v = bridge_visoes.compor(visoes, decisoes)
+    total_contato_sucesso = int(v["totais"]["ContatoSim"])
+    total_contato_sucesso_start = int(v["start_totais"]["ContatoSim"])
+
+    # Top bairros dos participantes do Start
+    top_bairros_start = bridge_visoes.ranking(v, "start_bairro", 5)
+    top_bairros_start.index = top_bairros_start.index + 1
+
+    return {
+        "metricas": {
+            "total_participantes_start": int(v["start_totais"]["Quantidade"]),
+            "total_participantes_start_geral": total_participantes_start_geral,
+            "total_contato_sucesso_start": total_contato_sucesso_start,
+            "percentual_participantes_start": (
+                round(total_contato_sucesso_start / total_contato_sucesso * 100) if total_contato_sucesso > 0 else 0
+            ),
+            "percentual_contato_sucesso_start": (
+                round(total_contato_sucesso_start / total_participantes_start_geral * 100)
+                if total_participantes_start_geral > 0 else 0
+            ),
+        },
+        "top_bairros": top_bairros_start,
+        "figuras": {
+            "start_bairros": fig_start_bairros(top_bairros_start),
+            "start_pizza": fig_start_pizza(top_bairros_start),
+            "funil": fig_funil_start(total_contato_sucesso, total_contato_sucesso_start),
+        },
+    }
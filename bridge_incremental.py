@@ -0,0 +1,140 @@
+"""Ingestão incremental do consolidado.
+
+A planilha é, na prática, só de acréscimo: novos contatos entram como novas
+linhas ao longo do ano. Para cada aba guardamos, além do snapshot bruto, o
+estado já preparado (frame normalizado + cubo) e o hash de cada linha bruta.
+Quando a planilha muda e as linhas antigas continuam iguais, só as linhas
+novas passam pela normalização e o cubo delas é somado ao cubo existente;
+se alguma linha antiga mudou (ou sumiu), reconstrói tudo. A versão do
+dicionário de bairros (`bridge_bairros`) faz parte da versão dos dados: com
+outro dicionário, tudo é normalizado de novo.
+"""
+import logging
+import pickle
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, union_categoricals
+
+import bridge_bairros
+import bridge_cubo
+import bridge_data
+
+log = logging.getLogger("bridge.dados")
+
+# 2: esquema compacto (MesOrd, Idade UInt8); 3: só COLUNAS_CONSOLIDADO; 4: datas_invalidas;
+# 5: bairros canônicos e bairros_nao_resolvidos; 6: hashes com colunas numéricas como float64
+FORMATO_ESTADO = 6
+
+
+def _caminho_estado(caminho, aba):
+    snap = bridge_data.caminho_snapshot(caminho, aba)
+    return snap.with_name(f"{snap.stem}__preparado.pkl")
+
+
+def _ler_estado(caminho, aba):
+    try:
+        with open(_caminho_estado(caminho, aba), "rb") as f:
+            estado = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return estado if estado.get("formato") == FORMATO_ESTADO else None
+
+
+def _gravar_estado(caminho, aba, estado):
+    destino = _caminho_estado(caminho, aba)
+    try:
+        destino.parent.mkdir(exist_ok=True)
+        bridge_data._gravar_atomico(destino, pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+
+
+def hash_linhas(bruto: pd.DataFrame):
+    """Hash de cada linha bruta, sem depender do dtype que a leitura deu às colunas.
+
+    Uma Idade vazia numa linha nova faz a coluna inteira virar float64: as
+    colunas numéricas entram no hash sempre como float64, e o prefixo antigo
+    continua com os mesmos hashes.
+    """
+    numericas = {col: "float64" for col in bruto.columns if is_numeric_dtype(bruto[col].dtype)}
+    return pd.util.hash_pandas_object(bruto.astype(numericas), index=False).to_numpy()
+
+
+def _anexar(antigo: pd.DataFrame, novo: pd.DataFrame) -> pd.DataFrame:
+    """Concatena frames preparados unindo as categorias (sem voltar para object)."""
+    df = pd.concat([antigo, novo], ignore_index=True)
+    for col in antigo.columns:
+        a, b = antigo[col], novo[col]
+        if isinstance(a.dtype, pd.CategoricalDtype) and isinstance(b.dtype, pd.CategoricalDtype):
+            if a.cat.ordered:  # Faixa Etária: mesmas categorias, já preservadas pelo concat
+                continue
+            if b.cat.categories.dtype != a.cat.categories.dtype:
+                # lote pequeno com a coluna toda vazia: categorias sem tipo de texto
+                b = b.cat.set_categories(b.cat.categories.astype(a.cat.categories.dtype))
+            df[col] = pd.Series(
+                union_categoricals([a.array, b.array], sort_categories=True), index=df.index, name=col
+            )
+    return df
+
+
+def carregar(caminho, aba) -> dict:
+    """Frame preparado e cubo de uma aba, reaproveitando o que já foi processado.
+
+    Só as colunas usadas pelo dashboard (`bridge_data.COLUNAS_CONSOLIDADO`)
+    são lidas, em streaming; mudanças nas demais colunas não contam como
+    linha alterada.
+
+    Devolve {"df", "cubo", "versao", "datas_invalidas", "bairros_nao_resolvidos",
+    "modo", "linhas_novas"}; `datas_invalidas` lista as linhas cujo Quando não
+    pôde ser lido (ficam fora dos gráficos mensais), `bairros_nao_resolvidos`
+    os bairros fora do dicionário (com registros e sugestão) e `modo` é
+    "cache" (nada mudou), "incremental" (só linhas acrescentadas) ou "completo".
+    O dicionário de bairros é o `bairros.json` da pasta da planilha.
+    """
+    colunas = bridge_data.COLUNAS_CONSOLIDADO
+    bairros = bridge_bairros.dicionario(Path(caminho).parent / bridge_bairros.ARQUIVO_BAIRROS)
+    versao = f"{bridge_data.versao_aba(caminho, aba, colunas)}:{bairros.versao}"
+    estado = _ler_estado(caminho, aba)
+    if estado is not None and estado["versao"] == versao:
+        return {**estado, "modo": "cache", "linhas_novas": 0}
+
+    bruto = bridge_data.ler_aba(caminho, aba, colunas)
+    hashes = hash_linhas(bruto)
+
+    # bairros já relatados antes não contam como novos no aviso do log
+    ja_relatados = set(estado["bairros_nao_resolvidos"]["Bairro"]) if estado is not None else set()
+    if estado is not None and estado["versao_bairros"] != bairros.versao:
+        estado = None  # outro dicionário de bairros: os rótulos já normalizados não valem mais
+    n = len(estado["hashes"]) if estado is not None else 0
+    if estado is not None and len(hashes) >= n and (hashes[:n] == estado["hashes"]).all():
+        delta = bridge_data.preparar(bruto.iloc[n:].copy(), bairros)
+        df = _anexar(estado["df"], delta)
+        cubo = bridge_cubo.somar([estado["cubo"], bridge_cubo.montar_cubo(delta)])
+        invalidas = pd.concat(
+            [estado["datas_invalidas"], bridge_data.datas_invalidas(bruto["Quando"].iloc[n:], delta["Quando"])],
+            ignore_index=True,
+        )
+        nao_resolvidos = bridge_bairros.somar_nao_resolvidos([
+            estado["bairros_nao_resolvidos"],
+            bairros.nao_resolvidos(delta["Bairro"], ignorar=[bridge_data.NAO_INFORMADO]),
+        ])
+        modo, linhas_novas = "incremental", len(delta)
+    else:
+        df = bridge_data.preparar(bruto.copy(), bairros)
+        cubo = bridge_cubo.montar_cubo(df)
+        invalidas = bridge_data.datas_invalidas(bruto["Quando"], df["Quando"])
+        nao_resolvidos = bairros.nao_resolvidos(df["Bairro"], ignorar=[bridge_data.NAO_INFORMADO])
+        modo, linhas_novas = "completo", len(df)
+
+    if len(invalidas):
+        log.warning("%s: %d linha(s) com data ilegível (ex.: linha %d: %r)", caminho, len(invalidas),
+                    invalidas["Linha"].iloc[0], invalidas["Quando"].iloc[0])
+    novos = sorted(set(nao_resolvidos["Bairro"]) - ja_relatados)
+    if novos:
+        log.warning("%s: %d bairro(s) novo(s) fora do dicionário %s: %s", caminho, len(novos),
+                    bridge_bairros.ARQUIVO_BAIRROS, ", ".join(map(repr, novos[:10])))
+    estado = {"formato": FORMATO_ESTADO, "versao": versao, "versao_bairros": bairros.versao, "hashes": hashes,
+              "df": df, "cubo": cubo, "datas_invalidas": invalidas, "bairros_nao_resolvidos": nao_resolvidos}
+    _gravar_estado(caminho, aba, estado)
+    return {**estado, "modo": modo, "linhas_novas": linhas_novas}
@@ -0,0 +1,86 @@
+"""Partida do dashboard com aquecimento antes de aceitar conexões.
+
+`streamlit run` só executa o script na primeira visita: quem chega logo
+depois de um restart ou deploy paga a importação do Plotly, a carga das
+planilhas e a montagem de todos os painéis. Aqui, no mesmo processo que vai
+servir o app:
+
+1. importa os módulos do dashboard (pandas, streamlit, plotly);
+2. executa o script uma vez sem navegador (`AppTest`), com todas as seções
+   abertas, o que sobe o vigia, carrega os anos padrão e deixa os painéis
+   dos filtros padrão no cache de filtros (os caches do `st.cache_resource`
+   são do processo e continuam valendo para as sessões reais);
+3. só então abre a porta.
+
+Sinal de prontidão: a porta só aceita conexões depois do aquecimento, e
+/_stcore/health responde "ok" a partir daí (serve de readiness probe). Os
+tempos de importação e de aquecimento vão para o log na partida.
+
+Uso (na raiz do repositório):
+    python bridge_servidor.py [--porta 8501] [--endereco 0.0.0.0]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+APP = Path(__file__).resolve().parent / "Dashboard_Bridge_Consolidado.py"
+SECOES_SOB_DEMANDA = ["aberta_pivot_contato", "aberta_faixas", "aberta_bairro_faixa", "aberta_evolucao_faixa"]
+
+log = logging.getLogger("bridge.servidor")
+
+
+def importar() -> float:
+    """Importa o que o script usa; devolve o tempo gasto (s)."""
+    inicio = time.perf_counter()
+    import plotly.express  # noqa: F401  (adiado no script; aqui vale pagar antes da porta abrir)
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest  # noqa: F401
+
+    import bridge_figuras  # noqa: F401
+    import bridge_vigia  # noqa: F401
+    return time.perf_counter() - inicio
+
+
+def aquecer(timeout: float = 600) -> float:
+    """Executa o script uma vez, com as seções sob demanda abertas; devolve o tempo gasto (s)."""
+    from streamlit.testing.v1 import AppTest
+
+    inicio = time.perf_counter()
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    for chave in SECOES_SOB_DEMANDA:
+        at.session_state[chave] = True
+    at.run()
+    for erro in at.exception:
+        log.warning("aquecimento: %s", erro.value)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--porta", type=int, default=8501)
+    parser.add_argument("--endereco", help="server.address do Streamlit (padrão: todas as interfaces)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    os.chdir(APP.parent)  # o script lê as planilhas e a logo da pasta do repositório
+
+    from streamlit.web import bootstrap
+
+    opcoes = {"server.port": args.porta, "server.headless": True}
+    if args.endereco:
+        opcoes["server.address"] = args.endereco
+    bootstrap.load_config_options(flag_options=opcoes)
+
+    t_import = importar()
+    log.info("importação: %.2f s", t_import)
+    t_aquecer = aquecer()
+    log.info("aquecimento (dados e painéis padrão): %.2f s", t_aquecer)
+    log.info("pronto: abrindo a porta %d", args.porta)
+    bootstrap.run(str(APP), False, [], opcoes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
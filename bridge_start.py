@@ -0,0 +1,27 @@
+"""Cruzamento Bridge × Start pelo telefone.
+
+Os telefones já chegam normalizados como chave inteira (coluna "Chave",
+ver `bridge_data.normalizar_telefone`). Os participantes do Start viram um
+índice hash de chaves únicas, montado uma vez por versão das planilhas do
+Start; o cruzamento com cada ano do consolidado é só um `isin` sobre a coluna
+inteira, guardado por (ano, versão do ano, versão do Start) — quando um lado
+muda, só as partições afetadas são recalculadas.
+"""
+import pandas as pd
+
+from bridge_data import normalizar_telefone
+
+ARQUIVO_START = "Paricipantes_Start.xlsx"
+ARQUIVO_ANALISE_START = "Analise_Start_Bridge.xlsx"
+COLUNAS_START = ["Telefone"]  # só o telefone é lido das planilhas do Start
+
+
+def montar_indice(frames) -> pd.Index:
+    """Índice (hash) das chaves de telefone únicas dos participantes do Start."""
+    chaves = pd.concat([normalizar_telefone(f["Telefone"]) for f in frames], ignore_index=True)
+    return pd.Index(chaves.dropna().unique().astype("int64"), name="Chave")
+
+
+def participantes(df: pd.DataFrame, indice: pd.Index) -> pd.DataFrame:
+    """Registros do Bridge cujo telefone está entre os participantes do Start."""
+    return df[df["Chave"].isin(indice)]
@@ -0,0 +1,148 @@
+"""Instrumentação leve do dashboard: tempo por seção e hits/misses dos loaders.
+
+Ligada pela variável de ambiente BRIDGE_INSTRUMENTAR=1, lida na importação.
+Desligada, `secao()` devolve um contexto nulo compartilhado, `medido()`
+devolve a própria função e `contar()` retorna na hora: custo praticamente zero.
+
+Ligada, cada medição entra no acumulado do processo (mostrado no painel de
+admin da sidebar) e vira uma linha JSON no logger "bridge.tempos" (stderr, ou
+o arquivo em BRIDGE_LOG_TEMPOS). O painel só aparece com ?admin=<token>, onde
+o token é o valor de BRIDGE_ADMIN_TOKEN.
+"""
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+ATIVO = os.environ.get("BRIDGE_INSTRUMENTAR", "") not in ("", "0")
+TOKEN_ADMIN = os.environ.get("BRIDGE_ADMIN_TOKEN") or None
+
+log = logging.getLogger("bridge.tempos")
+
+_NULO = contextlib.nullcontext()
+_lock = threading.Lock()
+_secoes = {}  # nome -> {"execucoes", "total", "ultimo", "max"}
+_cargas = {}  # nome -> {"chamadas", "misses"}  (consultas aos caches de dados)
+
+
+def _configurar_log():
+    if log.handlers:
+        return
+    destino = os.environ.get("BRIDGE_LOG_TEMPOS")
+    handler = logging.FileHandler(destino, encoding="utf-8") if destino else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+if ATIVO:
+    _configurar_log()
+
+
+def _emitir(evento: str, **campos):
+    log.info(json.dumps({"ts": round(time.time(), 3), "evento": evento, **campos}, ensure_ascii=False))
+
+
+def registrar(nome: str, segundos: float):
+    """Acumula uma medição de `nome` e a envia para o log."""
+    if not ATIVO:
+        return
+    with _lock:
+        s = _secoes.setdefault(nome, {"execucoes": 0, "total": 0.0, "ultimo": 0.0, "max": 0.0})
+        s["execucoes"] += 1
+        s["total"] += segundos
+        s["ultimo"] = segundos
+        s["max"] = max(s["max"], segundos)
+    _emitir("secao", secao=nome, ms=round(segundos * 1000, 3))
+
+
+class _Secao:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registrar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+def secao(nome: str):
+    """Context manager que mede o bloco como a seção `nome`."""
+    return _Secao(nome) if ATIVO else _NULO
+
+
+def medido(nome=None):
+    """Decorador: mede cada chamada da função (nome padrão: o da função)."""
+    def decorar(func):
+        if not ATIVO:
+            return func
+        rotulo = nome or func.__name__
+
+        @functools.wraps(func)
+        def medir(*args, **kwargs):
+            with _Secao(rotulo):
+                return func(*args, **kwargs)
+        return medir
+    return decorar
+
+
+def contar(nome: str, hit: bool):
+    """Conta uma consulta de `nome` a um cache de dados (hit ou miss)."""
+    if not ATIVO:
+        return
+    with _lock:
+        c = _cargas.setdefault(nome, {"chamadas": 0, "misses": 0})
+        c["chamadas"] += 1
+        c["misses"] += not hit
+
+
+def admin_autorizado(token) -> bool:
+    return ATIVO and TOKEN_ADMIN is not None and token == TOKEN_ADMIN
+
+
+def resumo() -> dict:
+    """Acumulados do processo: {"secoes": [...], "cargas": [...]} (tempos em ms)."""
+    with _lock:
+        secoes = [
+            {
+                "Seção": nome,
+                "Execuções": s["execucoes"],
+                "Último (ms)": round(s["ultimo"] * 1000, 1),
+                "Médio (ms)": round(s["total"] / s["execucoes"] * 1000, 1),
+                "Máximo (ms)": round(s["max"] * 1000, 1),
+            }
+            for nome, s in _secoes.items()
+        ]
+        cargas = [
+            {
+                "Loader": nome,
+                "Chamadas": c["chamadas"],
+                "Hits": c["chamadas"] - c["misses"],
+                "Misses": c["misses"],
+                "Hit rate": round((c["chamadas"] - c["misses"]) / c["chamadas"], 2) if c["chamadas"] else 0.0,
+            }
+            for nome, c in _cargas.items()
+        ]
+    return {"secoes": secoes, "cargas": cargas}
+
+
+def ultimo(nome: str):
+    """Duração (s) da última execução de `nome`, ou None."""
+    with _lock:
+        s = _secoes.get(nome)
+        return s["ultimo"] if s else None
+
+
+def zerar():
+    with _lock:
+        _secoes.clear()
+        _cargas.clear()
@@ -0,0 +1,317 @@
+"""Vigia das planilhas: recarga em segundo plano e troca atômica da versão dos dados.
+
+Uma thread do processo confere (por mtime/tamanho) as planilhas dos anos em
+uso, as do Start e o dicionário de bairros a cada `intervalo` segundos. Quando
+alguma muda, reconstrói só as partições afetadas (snapshot, carga incremental,
+cubo, cruzamento com o Start, visões por decisão) fora do caminho das
+requisições e publica uma nova versão trocando uma única referência. Cada
+execução do script lê a publicação vigente uma vez, de modo que todas as
+seções (e todas as sessões) veem a mesma versão dos dados; ninguém espera pelo
+re-parse de uma planilha alterada.
+
+A publicação é o armazém de dados compartilhado do processo: as sessões
+recebem referências aos mesmos frames (sem cópia; o copy-on-write do pandas
+impede que um recorte altere o original), nunca cópias por sessão. O
+orçamento de memória (`orcamento_mb`, padrão BRIDGE_ORCAMENTO_DADOS_MB ou
+512 MB) é conferido a cada publicação. Se passar dele, os anos usados há mais
+tempo saem da publicação e deixam de ser vigiados, até que alguém os peça de
+novo. A versão anterior some da memória quando a última execução que a lia
+termina.
+
+Uma publicação é um dict somente leitura:
+    {"criada_em", "fontes": {chave: (mtime_ns, tamanho)},
+     "anos": {ano: {"versao", "df", "cubo", "cubo_start", "visoes", "info", "mb"}},
+     "indice_start", "total_start", "versao_start"}
+
+`total_start` é o número de linhas de Paricipantes_Start.xlsx (o "Total de
+Participantes do Start" do painel); `indice_start` tem os telefones únicos das
+duas planilhas do Start, usados só no cruzamento.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import bridge_bairros
+import bridge_cubo
+import bridge_data
+import bridge_incremental
+import bridge_start
+import bridge_tempos
+import bridge_visoes
+
+INTERVALO = 5.0  # segundos entre verificações das planilhas
+ORCAMENTO_MB = float(os.environ.get("BRIDGE_ORCAMENTO_DADOS_MB", 512))
+EM_USO = 60.0  # segundos: anos pedidos nesse intervalo não saem da memória
+
+log = logging.getLogger("bridge.vigia")
+
+
+CHAVES_START = ("start", "analise_start")
+
+
+def _fontes_start(pasta=".") -> dict:
+    pasta = Path(pasta)
+    return {
+        "start": (pasta / bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START),
+        "analise_start": (pasta / bridge_start.ARQUIVO_ANALISE_START, "Start", bridge_start.COLUNAS_START),
+    }
+
+
+def memoria_mb(publicacao) -> float:
+    """Memória dos dados de uma publicação (frames, cubos e índice do Start)."""
+    if publicacao is None:
+        return 0.0
+    return sum(p["mb"] for p in publicacao["anos"].values()) + bridge_data.memoria_mb(publicacao["indice_start"])
+
+
+def _assinatura(caminho):
+    try:
+        fp = bridge_data.fingerprint(caminho)
+    except OSError:
+        return None
+    return fp["mtime_ns"], fp["tamanho"]
+
+
+class Vigia:
+    def __init__(self, pasta=".", intervalo: float = INTERVALO, orcamento_mb: float = ORCAMENTO_MB):
+        self.pasta = pasta
+        self.intervalo = intervalo
+        self.orcamento_mb = orcamento_mb
+        self._anos_ativos = set()
+        self._ultimo_uso = {}  # ano -> time.monotonic() do último pedido
+        self._ao_publicar = []
+        self._atual = None
+        self._erros = {}  # chave -> exceção da última tentativa
+        self._cond = threading.Condition()
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+
+    # ----- lado das sessões -----
+
+    def iniciar(self, anos=()):
+        """Começa a vigiar (e a carregar) os `anos` indicados; não bloqueia."""
+        self.solicitar(anos)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._executar, name="bridge-vigia", daemon=True)
+            self._thread.start()
+        return self
+
+    def solicitar(self, anos):
+        """Inclui `anos` entre os vigiados; a carga dos novos começa em segundo plano."""
+        novos = set(anos) - self._anos_ativos
+        if novos:
+            with self._cond:
+                self._anos_ativos |= novos
+            self._acordar.set()
+
+    def obter(self, anos) -> dict:
+        """Publicação vigente com os `anos` pedidos (espera só se algum ainda não foi carregado)."""
+        anos = list(anos)
+        agora = time.monotonic()
+        for ano in anos:
+            self._ultimo_uso[ano] = agora
+        atual = self._atual
+        if atual is not None and all(ano in atual["anos"] for ano in anos):
+            bridge_tempos.contar("vigia", hit=True)
+            return atual
+
+        bridge_tempos.contar("vigia", hit=False)
+        with self._cond:
+            while not self._pronto(anos):
+                self.solicitar(anos)  # o ano pode ter saído da memória no meio do caminho
+                self._cond.wait(self.intervalo)
+            atual = self._atual
+        faltando = [ano for ano in anos if atual is None or ano not in atual["anos"]]
+        if faltando:
+            erro = self._erros.get(faltando[0]) or self._erros.get("start")
+            raise erro or RuntimeError(f"dados do ano {faltando[0]} indisponíveis")
+        return atual
+
+    def atual(self):
+        return self._atual
+
+    def ao_publicar(self, func):
+        """Registra `func(publicacao)`, chamada (na thread do vigia) a cada nova publicação."""
+        self._ao_publicar.append(func)
+
+    def parar(self):
+        self._parar.set()
+        self._acordar.set()
+
+    # ----- thread de recarga -----
+
+    def _pronto(self, anos) -> bool:
+        atual = self._atual
+        return all(
+            (atual is not None and ano in atual["anos"]) or ano in self._erros or "start" in self._erros
+            for ano in anos
+        )
+
+    def _executar(self):
+        while not self._parar.is_set():
+            try:
+                self.atualizar()
+            except Exception:  # a thread não pode morrer: tenta de novo na próxima volta
+                log.exception("falha ao recarregar as planilhas")
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+
+    def atualizar(self) -> bool:
+        """Confere as planilhas e publica uma nova versão se algo mudou; devolve se publicou."""
+        anterior = self._atual
+        with self._cond:
+            ativos = set(self._anos_ativos)
+        disponiveis = bridge_data.descobrir_anos(self.pasta)
+        fontes = {ano: (disponiveis[ano], bridge_data.aba_consolidado(ano), bridge_data.COLUNAS_CONSOLIDADO)
+                  for ano in sorted(ativos) if ano in disponiveis}
+        fontes.update(_fontes_start(self.pasta))
+        assinaturas = {chave: _assinatura(fonte[0]) for chave, fonte in fontes.items()}
+        assinaturas["bairros"] = _assinatura(Path(self.pasta) / bridge_bairros.ARQUIVO_BAIRROS)
+
+        mudou = {
+            chave for chave in fontes
+            if anterior is None or anterior["fontes"].get(chave) != assinaturas[chave]
+            or (chave not in CHAVES_START and chave not in anterior["anos"])
+        }
+        if anterior is not None and anterior["fontes"].get("bairros") != assinaturas["bairros"]:
+            # dicionário de bairros editado: todos os anos são normalizados de novo
+            mudou |= {chave for chave in fontes if chave not in CHAVES_START}
+        for ano in ativos - set(disponiveis):
+            self._erros[ano] = FileNotFoundError(f"planilha do ano {ano} não encontrada")
+        if not mudou:
+            if anterior is not None and memoria_mb(anterior) > self.orcamento_mb:
+                # nada mudou, mas pode haver anos parados há tempo a tirar da memória
+                nova = self._aplicar_orcamento({**anterior, "anos": dict(anterior["anos"]),
+                                                "fontes": dict(anterior["fontes"])})
+                if len(nova["anos"]) < len(anterior["anos"]):
+                    self._publicar(nova)
+                    return True
+            if self._erros:
+                with self._cond:
+                    self._cond.notify_all()
+            return False
+
+        with bridge_tempos.secao("vigia_recarga"):
+            nova = self._construir(anterior, fontes, assinaturas, mudou)
+        if nova is anterior:
+            with self._cond:
+                self._cond.notify_all()  # sessões à espera veem o erro registrado
+            return False
+        self._publicar(self._aplicar_orcamento(nova))
+        log.info("planilhas recarregadas: %s", sorted(mudou, key=str))
+        return True
+
+    def _publicar(self, nova):
+        with self._cond:
+            self._atual = nova
+            self._cond.notify_all()
+        log.info("dados publicados (%.1f MB)", memoria_mb(nova))
+        for func in self._ao_publicar:
+            try:
+                func(nova)
+            except Exception:
+                log.exception("falha no aviso de publicação")
+
+    def _aplicar_orcamento(self, nova) -> dict:
+        """Tira da publicação os anos usados há mais tempo até caber no orçamento (fica ao menos um)."""
+        while memoria_mb(nova) > self.orcamento_mb:
+            # anos pedidos há menos de EM_USO segundos ficam, mesmo passando do orçamento
+            limite = time.monotonic() - EM_USO
+            candidatos = [a for a in nova["anos"] if self._ultimo_uso.get(a, 0.0) < limite]
+            if not candidatos or len(nova["anos"]) == 1:
+                break
+            ano = min(candidatos, key=lambda a: self._ultimo_uso.get(a, 0.0))
+            with self._cond:
+                self._anos_ativos.discard(ano)
+            nova["anos"].pop(ano)
+            nova["fontes"].pop(ano, None)
+            log.info("ano %s fora da memória (orçamento de %.0f MB)", ano, self.orcamento_mb)
+        return nova
+
+    def _construir(self, anterior, fontes, assinaturas, mudou) -> dict:
+        # parse das planilhas alteradas em paralelo (vira snapshot em disco)
+        futuros = bridge_data.pre_carregar({chave: fontes[chave] for chave in mudou})
+        for chave, futuro in futuros.items():
+            try:
+                futuro.result()
+            except Exception as exc:  # planilha corrompida ou ainda sendo salva
+                self._erros[chave] = exc
+                log.warning("planilha %s ilegível: %s", fontes[chave][0], exc)
+
+        nova = {
+            "criada_em": datetime.now(),
+            "fontes": {**(anterior["fontes"] if anterior else {}), "bairros": assinaturas["bairros"]},
+            "anos": dict(anterior["anos"]) if anterior else {},
+            "indice_start": anterior["indice_start"] if anterior else None,
+            "total_start": anterior["total_start"] if anterior else None,
+            "versao_start": anterior["versao_start"] if anterior else None,
+        }
+
+        start_mudou = bool(mudou & set(CHAVES_START))
+        if start_mudou:
+            try:
+                frames = {chave: bridge_data.ler_aba(*fontes[chave]) for chave in CHAVES_START}
+                nova["indice_start"] = bridge_start.montar_indice(frames.values())
+                nova["total_start"] = len(frames["start"])
+                nova["versao_start"] = tuple(
+                    bridge_data.versao_aba(*fontes[chave]) for chave in CHAVES_START
+                )
+                for chave in CHAVES_START:
+                    nova["fontes"][chave] = assinaturas[chave]
+                    self._erros.pop(chave, None)
+            except Exception as exc:
+                self._erros["start"] = exc
+                log.warning("planilhas do Start ilegíveis: %s", exc)
+                start_mudou = False
+        if nova["indice_start"] is None:
+            # sem índice do Start não há cruzamento possível: nada a publicar ainda
+            return anterior
+        alterou = start_mudou
+
+        refeitas = []
+        for ano, (caminho, aba, _) in fontes.items():
+            if ano in CHAVES_START:
+                continue
+            if ano in mudou:
+                try:
+                    carga = bridge_incremental.carregar(caminho, aba)
+                except Exception as exc:
+                    self._erros[ano] = exc
+                    log.warning("planilha %s ilegível: %s", caminho, exc)
+                    continue
+                df = carga["df"]
+                nova["anos"][ano] = {
+                    "versao": carga["versao"],
+                    "df": df,
+                    "cubo": carga["cubo"],
+                    "info": {"data_max": df["Quando"].max(), "decisoes": df["Decisão"].unique().tolist(),
+                             "datas_invalidas": carga["datas_invalidas"],
+                             "bairros_nao_resolvidos": carga["bairros_nao_resolvidos"]},
+                }
+                nova["fontes"][ano] = assinaturas[ano]
+                self._erros.pop(ano, None)
+                alterou = True
+            elif start_mudou:
+                nova["anos"][ano] = dict(nova["anos"][ano])
+            else:
+                continue
+            particao = nova["anos"][ano]
+            particao["cubo_start"] = bridge_cubo.montar_cubo(
+                bridge_start.participantes(particao["df"], nova["indice_start"])
+            )
+            refeitas.append(ano)
+
+        # visões por decisão das partições refeitas (várias de uma vez, para o pool de processos)
+        visoes = bridge_visoes.materializar({ano: (nova["anos"][ano]["cubo"], nova["anos"][ano]["cubo_start"])
+                                             for ano in refeitas})
+        for ano in refeitas:
+            particao = nova["anos"][ano]
+            particao["visoes"] = visoes[ano]
+            particao["mb"] = bridge_data.memoria_mb(
+                [particao["df"], particao["cubo"], particao["cubo_start"], *particao["visoes"].values()]
+            )
+        return nova if alterou else anterior
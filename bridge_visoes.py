@@ -0,0 +1,224 @@
+"""Visões materializadas do cubo, uma por valor de Decisão.
+
+O filtro de Decisão da sidebar tem poucos valores distintos. A cada nova
+versão dos dados, cada partição (ano) ganha uma visão "todas" e uma visão por
+valor de Decisão: tabelas pequenas e aditivas (totais, quantidades por
+decisão, bairro e mês, e o mesmo do cubo cruzado com o Start). Qualquer outra
+seleção é a soma das visões dos valores escolhidos, e vários anos se juntam
+do mesmo jeito: mudar o filtro não recorta nem agrupa o cubo, só soma
+algumas tabelas de poucas linhas.
+
+Uma visão é um dict somente leitura:
+    {"totais": Series(Quantidade, ContatoSim, SomaIdade, QtdIdade),
+     "decisao", "bairro", "mensal": Series de Quantidade por Decisão/Bairro/MesOrd,
+     "start_totais": Series(Quantidade, ContatoSim), "start_bairro"}
+
+As visões de uma partição ficam em {TODAS: visão, decisão: visão, ...}, com
+as tabelas de cada decisão alinhadas às da visão TODAS (zeros onde a decisão
+não aparece): somar decisões do mesmo ano é uma soma de vetores.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import bridge_cubo
+import bridge_tempos
+from bridge_data import NAO_INFORMADO
+
+TODAS = None  # chave da visão sem filtro
+ACEITOU = "Aceitou Jesus"
+# linhas de cubo a partir das quais a materialização vai para um pool de
+# processos; abaixo disso, iniciar os processos custa mais do que agregar
+LIMIAR_PROCESSOS = 200_000
+# o pool roda a partir da thread do vigia, dentro do servidor (várias threads):
+# um fork herdaria locks presos por outras threads; forkserver/spawn não
+INICIO_PROCESSOS = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_TABELAS = {"decisao": "Decisão", "bairro": "Bairro", "mensal": "MesOrd", "start_bairro": "Bairro"}
+
+
+def _contagem(cubo: pd.DataFrame, dim: str) -> pd.Series:
+    return bridge_cubo.contagem(cubo, dim).set_index(dim)["Quantidade"]
+
+
+def visao(cubo: pd.DataFrame, cubo_start: pd.DataFrame) -> dict:
+    """Tabelas aditivas de um recorte do cubo e do cubo do Start."""
+    return {
+        "totais": pd.Series(bridge_cubo.totais(cubo), dtype="int64"),
+        "decisao": _contagem(cubo, "Decisão"),
+        "bairro": _contagem(cubo, "Bairro"),
+        "mensal": _contagem(cubo, "MesOrd"),
+        "start_totais": pd.Series(
+            {"Quantidade": bridge_cubo.total(cubo_start), "ContatoSim": bridge_cubo.total_contato(cubo_start, "Sim")},
+            dtype="int64",
+        ),
+        "start_bairro": _contagem(cubo_start, "Bairro"),
+    }
+
+
+_ZEROS = pd.Series(0, index=["Quantidade", "ContatoSim", "SomaIdade", "QtdIdade"], dtype="int64")
+_VAZIA = {
+    "totais": _ZEROS,
+    **{nome: pd.Series(dtype="int64", name="Quantidade").rename_axis(dim) for nome, dim in _TABELAS.items()},
+    "start_totais": _ZEROS[["Quantidade", "ContatoSim"]],
+}
+
+
+def somar(visoes) -> dict:
+    """Soma visões (decisões ou anos diferentes); sem nenhuma, a visão vazia."""
+    visoes = list(visoes)
+    if not visoes:
+        return _VAZIA
+    if len(visoes) == 1:
+        return visoes[0]
+    soma = {}
+    for nome in visoes[0]:
+        partes = [v[nome] for v in visoes]
+        if nome in _TABELAS and any(p.index is not partes[0].index for p in partes):
+            # anos diferentes: os índices não coincidem (nem as categorias de cada ano)
+            soma[nome] = pd.concat(partes).groupby(level=0).sum()
+            if any(isinstance(p.index, pd.CategoricalIndex) for p in partes):
+                # categoria de novo, como no cubo juntado (`bridge_cubo.combinar`)
+                soma[nome].index = pd.CategoricalIndex(soma[nome].index, name=soma[nome].index.name)
+        else:
+            soma[nome] = sum(partes[1:], partes[0])
+    return soma
+
+
+@bridge_tempos.medido()
+def materializar(cubos: dict, processos=None) -> dict:
+    """Visões de várias partições: {chave: (cubo, cubo_start)} -> {chave: {TODAS: visão, decisão: visão}}.
+
+    Cada (partição, decisão) é uma tarefa; com `processos` (padrão: cubos com
+    pelo menos LIMIAR_PROCESSOS linhas, havendo mais de uma CPU) elas rodam
+    num pool de processos.
+    """
+    tarefas = {}
+    for chave, (cubo, cubo_start) in cubos.items():
+        tarefas[chave, TODAS] = (cubo, cubo_start)
+        for decisao, parte in cubo.groupby("Decisão", observed=True):
+            tarefas[chave, decisao] = (parte, cubo_start[cubo_start["Decisão"] == decisao])
+
+    cpus = os.cpu_count() or 1
+    if processos is None:
+        processos = cpus > 1 and sum(len(cubo) for cubo, _ in cubos.values()) >= LIMIAR_PROCESSOS
+    if processos and tarefas:
+        contexto = multiprocessing.get_context(INICIO_PROCESSOS)
+        with ProcessPoolExecutor(max_workers=min(len(tarefas), cpus), mp_context=contexto) as executor:
+            futuros = {tarefa: executor.submit(visao, *args) for tarefa, args in tarefas.items()}
+            prontas = {tarefa: futuro.result() for tarefa, futuro in futuros.items()}
+    else:
+        prontas = {tarefa: visao(*args) for tarefa, args in tarefas.items()}
+
+    visoes = {chave: {} for chave in cubos}
+    for (chave, decisao), v in prontas.items():
+        visoes[chave][decisao] = v
+    return {chave: _alinhar(por_decisao, por_decisao[TODAS]) for chave, por_decisao in visoes.items()}
+
+
+def _alinhar(visoes: dict, referencia: dict) -> dict:
+    """Reindexa as tabelas de cada visão pelas de `referencia` (zeros onde faltam).
+
+    Todas passam a usar o mesmo objeto de índice, e a soma não precisa realinhar.
+    """
+    indices = {nome: referencia[nome].index for nome in _TABELAS}
+    return {
+        chave: {**v, **{nome: v[nome].reindex(indice, fill_value=0).set_axis(indice)
+                        for nome, indice in indices.items()}}
+        for chave, v in visoes.items()
+    }
+
+
+def combinar(visoes_por_ano) -> dict:
+    """Junta as visões de vários anos somando, por chave (TODAS e cada decisão).
+
+    O resultado fica alinhado como as visões de um ano só (vale guardá-lo por
+    versão dos dados: compor decisões sobre ele volta a ser soma de vetores).
+    """
+    visoes_por_ano = list(visoes_por_ano)
+    if len(visoes_por_ano) == 1:
+        return visoes_por_ano[0]
+    todas = somar(v[TODAS] for v in visoes_por_ano)
+    alinhadas = [_alinhar(visoes, todas) for visoes in visoes_por_ano]
+    chaves = dict.fromkeys(chave for visoes in alinhadas for chave in visoes)
+    return {chave: somar(v[chave] for v in alinhadas if chave in v) for chave in chaves}
+
+
+def compor(visoes: dict, decisoes=None) -> dict:
+    """Visão de uma seleção de decisões (vazio/None = todas) somando as visões de cada valor."""
+    if not decisoes:
+        return visoes[TODAS]
+    return somar(visoes[d] for d in dict.fromkeys(decisoes) if d in visoes)
+
+
+# ===============================
+# Roll-ups de uma visão (mesmo resultado das funções de `bridge_cubo` no cubo filtrado)
+# ===============================
+
+def metricas(v: dict) -> dict:
+    return bridge_cubo.metricas_totais(v["totais"])
+
+
+def _positivos(serie: pd.Series) -> pd.Series:
+    return serie[serie > 0]
+
+
+def ranking(v: dict, tabela: str, n=None, excluir=NAO_INFORMADO) -> pd.DataFrame:
+    serie = _positivos(v[tabela])
+    if excluir is not None:
+        serie = serie[serie.index != excluir]
+    return bridge_cubo.ordenar_ranking(serie.rename_axis(_TABELAS[tabela]).reset_index(), _TABELAS[tabela], n)
+
+
+def serie_mensal(v: dict) -> pd.DataFrame:
+    return bridge_cubo.com_rotulo_mes(_positivos(v["mensal"]).rename_axis("MesOrd").reset_index())
+
+
+def aceitou_mensal(visoes: dict, decisoes=None) -> pd.DataFrame:
+    """Série mensal de "Aceitou Jesus", vazia se a seleção não o inclui."""
+    incluido = not decisoes or ACEITOU in decisoes
+    return serie_mensal(visoes[ACEITOU] if incluido and ACEITOU in visoes else _VAZIA)
+
+
+# ===============================
+# Comparativo entre anos (uma partição = um ano)
+# ===============================
+
+def resumo_anual(visoes_por_ano: dict, decisoes=None) -> pd.DataFrame:
+    """Totais por ano a partir das visões de cada partição."""
+    linhas = []
+    for ano, visoes in sorted(visoes_por_ano.items()):
+        somas = compor(visoes, decisoes)["totais"]
+        total_ano, contato = int(somas["Quantidade"]), int(somas["ContatoSim"])
+        linhas.append({
+            "Ano": ano,
+            "Decisões": total_ano,
+            "Contatos": contato,
+            "% Contatos": round(contato / total_ano * 100, 1) if total_ano else 0.0,
+            "Média de Idade": (
+                round(float(somas["SomaIdade"] / somas["QtdIdade"]), 1)
+                if total_ano and somas["QtdIdade"] else float("nan")
+            ),
+        })
+    resumo = pd.DataFrame(linhas)
+    if not resumo.empty:
+        resumo["Variação Decisões (%)"] = (resumo["Decisões"].pct_change() * 100).round(1)
+    return resumo
+
+
+def comparativo_mensal(visoes_por_ano: dict, decisoes=None) -> pd.DataFrame:
+    """Quantidade por mês do ano (1–12) para cada ano, lado a lado."""
+    partes = []
+    for ano, visoes in sorted(visoes_por_ano.items()):
+        serie = _positivos(compor(visoes, decisoes)["mensal"])
+        partes.append(pd.DataFrame({
+            "Ano": str(ano),
+            "Mês": serie.index.to_numpy() % 12 + 1,
+            "Quantidade": serie.to_numpy(),
+        }))
+    if not partes:
+        return pd.DataFrame(columns=["Ano", "Mês", "Quantidade"])
+    # uma planilha anual pode trazer registros de outro ano: soma por mês do ano
+    return pd.concat(partes, ignore_index=True).groupby(["Ano", "Mês"], as_index=False)["Quantidade"].sum()
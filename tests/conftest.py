@@ -0,0 +1,30 @@
+import shutil
+from pathlib import Path
+
+import openpyxl
+import pytest
+import streamlit as st
+
+import bridge_data
+
+RAIZ = Path(__file__).resolve().parent.parent
+ANO_VAZIO = 2027
+
+
+@pytest.fixture
+def arvore_com_ano_vazio(tmp_path, monkeypatch):
+    """Cópia do app e das planilhas mais um consolidado de ANO_VAZIO só com o cabeçalho (cwd na cópia)."""
+    for padrao in ("*.py", "*.xlsx", "bairros.json"):
+        for caminho in RAIZ.glob(padrao):
+            shutil.copy(caminho, tmp_path)
+    shutil.copytree(RAIZ / "images", tmp_path / "images")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = bridge_data.aba_consolidado(ANO_VAZIO)
+    ws.append(bridge_data.COLUNAS_CONSOLIDADO)
+    wb.save(tmp_path / f"Consolidado_Bridge_{ANO_VAZIO}.xlsx")
+    monkeypatch.chdir(tmp_path)
+    # o vigia e os painéis ficam em st.cache_resource: nada de outra pasta entra no teste
+    st.cache_resource.clear()
+    yield tmp_path
+    st.cache_resource.clear()
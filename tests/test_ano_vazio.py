@@ -0,0 +1,50 @@
+"""Dashboard com a planilha de um ano novo que ainda só tem o cabeçalho."""
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import bridge_data
+import bridge_export
+from conftest import ANO_VAZIO
+
+
+def _abrir(pasta):
+    return AppTest.from_file(str(pasta / "Dashboard_Bridge_Consolidado.py"), default_timeout=300).run()
+
+
+def test_data_mais_recente_ignora_nat():
+    datas = [pd.NaT, pd.Timestamp("2026-04-28"), pd.Timestamp("2025-12-30")]
+    assert bridge_data.data_mais_recente(datas) == pd.Timestamp("2026-04-28")
+    assert bridge_data.data_mais_recente([pd.NaT]) is None
+    assert bridge_data.periodo(2025, datas) == "Período: 01/01/2025 até 28/04/2026"
+    assert bridge_data.periodo(ANO_VAZIO, [pd.NaT]) == f"Período: 01/01/{ANO_VAZIO} (sem registros)"
+
+
+def test_ano_padrao_e_o_mais_recente_com_registros(arvore_com_ano_vazio):
+    anos = bridge_data.descobrir_anos()
+    assert list(anos)[0] == ANO_VAZIO
+    assert bridge_data.anos_padrao(anos) == [2026]
+
+
+@pytest.mark.parametrize("anos", [None, [ANO_VAZIO], [ANO_VAZIO, 2026]])
+def test_dashboard_com_ano_vazio(arvore_com_ano_vazio, anos):
+    at = _abrir(arvore_com_ano_vazio)
+    if anos is not None:
+        at.sidebar.multiselect[0].set_value(anos).run()
+    assert not at.exception
+    assert at.get("plotly_chart")  # gráficos montados mesmo sem registros
+
+    kpis = [m.value for m in at.metric[:4]]
+    if anos == [ANO_VAZIO]:
+        assert kpis == ["0", "0", "0%", "0 anos"]
+        assert any(f"01/01/{ANO_VAZIO} (sem registros)" in md.value for md in at.markdown)
+    else:
+        assert kpis[0] != "0"  # 2026 (padrão ou junto com o ano vazio)
+        assert any("até " in md.value for md in at.markdown if "Período" in md.value)
+
+
+def test_exportacao_com_ano_vazio(arvore_com_ano_vazio):
+    padrao = bridge_export.exportar(arvore_com_ano_vazio / "relatorio", forcar=True)
+    assert "01/01/2026 até " in padrao[0].read_text(encoding="utf-8")
+    so_vazio = bridge_export.exportar(arvore_com_ano_vazio / "vazio", anos=[ANO_VAZIO], por_decisao=True, forcar=True)
+    assert f"01/01/{ANO_VAZIO} (sem registros)" in so_vazio[0].read_text(encoding="utf-8")
@@ -0,0 +1,64 @@
+"""Resolução de grafias de Bairro pelo dicionário (chave dobrada, variantes, trigramas)."""
+import pytest
+
+import bridge_bairros
+from conftest import RAIZ
+
+FREGUESIAS = ["Freguesia", "Freguesia (Ilha Do Governador)", "Freguesia (Jacarepaguá)"]
+
+
+@pytest.mark.parametrize("bairros, variantes, valor, esperado", [
+    # acento, caixa e pontuação não contam
+    (["Gávea"], {}, "Gavea", "Gávea"),
+    (["Gávea"], {}, " GÁVEA. ", "Gávea"),
+    (["São Conrado"], {}, "sao-conrado", "São Conrado"),
+    # erro de digitação com um único canônico acima do mínimo
+    (["Vila Alfa", "Vila Alfo"], {}, "Vila Alfaa", "Vila Alfa"),
+    # variante listada no dicionário ganha dos trigramas (e das regras de complemento)
+    (["Bonsucesso"], {"Bonsusseco": "Bonsucesso"}, "bonsusseco", "Bonsucesso"),
+    (FREGUESIAS, {"Freguesia (Ilha)": "Freguesia (Ilha Do Governador)"}, "Freguesia (Ilha)",
+     "Freguesia (Ilha Do Governador)"),
+    (["Botafogo"], {"Botafogo - RJ": "Botafogo"}, "Botafogo - RJ", "Botafogo"),
+    # nome com complemento pode ser outro bairro: só entra pelo dicionário
+    (["Botafogo"], {}, "Botafogo - RJ", None),
+    (["Botafogo"], {}, "Botafogo, RJ", None),
+    (["Botafogo"], {}, "Botafogo Rj", None),
+    (FREGUESIAS, {}, "Freguesia (Ilha)", None),
+    # empate no melhor trigrama: não escolhe
+    (["Vila Alfa", "Vila Alfo"], {}, "Vila Alf", None),
+    (["Vila Alfa", "Vila Alfo"], {}, "Vila Alfx", None),
+    # abaixo de SIMILARIDADE_MINIMA
+    (["Copacabana"], {}, "Copacab", None),
+    (["Tijuca", "Tijuquinha"], {}, "Tijuka", None),
+    # curto demais para trigramas, ou sem nenhum em comum
+    (["Ramos"], {}, "RJ", None),
+    (["Ramos"], {}, "Xyz", None),
+])
+def test_resolver(bairros, variantes, valor, esperado):
+    dicionario = bridge_bairros.Dicionario(bairros, variantes)
+    canonico, similaridade = dicionario.resolver(valor)
+    assert canonico == esperado
+    assert dicionario.canonico(valor) == (esperado or valor)
+    if esperado is not None and not variantes:
+        assert similaridade >= bridge_bairros.SIMILARIDADE_MINIMA
+
+
+def test_similaridades_dos_casos_de_fronteira():
+    empate = bridge_bairros.Dicionario(["Vila Alfa", "Vila Alfo"])
+    assert empate.resolver("Vila Alf")[1] >= bridge_bairros.SIMILARIDADE_MINIMA  # recusado só pelo empate
+    abaixo = bridge_bairros.Dicionario(["Copacabana"])
+    similaridade = abaixo.resolver("Copacab")[1]
+    assert bridge_bairros.SIMILARIDADE_SUGESTAO <= similaridade < bridge_bairros.SIMILARIDADE_MINIMA
+    assert abaixo.sugestao("Copacab") == "Copacabana"  # fica no relatório com sugestão
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("Gavea", "Gávea"),
+    ("Jacarepagua", "Jacarepaguá"),
+    ("Copacaba", "Copacabana"),
+    ("Freguesia", "Freguesia"),
+    ("Freguesia (Ilha)", "Freguesia (Ilha Do Governador)"),
+    ("Botafogo - RJ", None),
+])
+def test_resolver_com_bairros_json(valor, esperado):
+    assert bridge_bairros.ler(RAIZ / bridge_bairros.ARQUIVO_BAIRROS).resolver(valor)[0] == esperado
@@ -0,0 +1,65 @@
+"""Conversão de Quando e rótulos de mês."""
+import datetime as dt
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import bridge_data
+
+MARCO = pd.Timestamp("2026-03-05")
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    # dd/mm/aaaa, com e sem zeros, hora depois da data ignorada
+    ("05/03/2026", MARCO),
+    ("5/3/2026", MARCO),
+    ("05/03/2026 14:30", MARCO),
+    # ISO, com espaços em volta
+    ("2026-03-05", MARCO),
+    (" 2026-03-05 ", MARCO),
+    # células de data do Excel já chegam como datetime
+    (dt.datetime(2026, 3, 5, 10), pd.Timestamp("2026-03-05 10:00")),
+    (pd.Timestamp("2026-03-05"), MARCO),
+    # lixo vira NaT
+    ("31/02/2026", pd.NaT),
+    ("2026-13-01", pd.NaT),
+    ("ontem", pd.NaT),
+    (46086, pd.NaT),
+    (None, pd.NaT),
+])
+def test_converter_datas(valor, esperado):
+    datas = bridge_data.converter_datas(pd.Series([valor], dtype=object))
+    assert pd.api.types.is_datetime64_any_dtype(datas)
+    if esperado is pd.NaT:
+        assert pd.isna(datas.iloc[0])
+    else:
+        assert datas.iloc[0] == esperado
+
+
+def test_datas_da_planilha_e_invalidas(tmp_path):
+    """Células de data e texto na mesma coluna; as que não viram data vão para o relatório."""
+    caminho = tmp_path / "Consolidado_Bridge_2026.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = bridge_data.aba_consolidado(2026)
+    ws.append(["Quando"])
+    for quando in [dt.datetime(2026, 3, 5), "06/03/2026", "2026-03-07", "sem data", None]:
+        ws.append([quando])
+    wb.save(caminho)
+
+    valores = bridge_data.ler_aba(caminho, bridge_data.aba_consolidado(2026), ["Quando"])["Quando"]
+    datas = bridge_data.converter_datas(valores)
+    assert datas.iloc[:3].tolist() == [MARCO, pd.Timestamp("2026-03-06"), pd.Timestamp("2026-03-07")]
+    assert datas.iloc[3:].isna().all()
+    invalidas = bridge_data.datas_invalidas(valores, datas)
+    assert invalidas.to_dict("list") == {"Linha": [5], "Quando": ["sem data"]}
+
+
+def test_rotulo_mes():
+    ordinais = pd.Series([2026 * 12 + 2, None, 2025 * 12 + 11, 2026 * 12 + 2], dtype="Int32")
+    rotulos = bridge_data.rotulo_mes(ordinais)
+    assert rotulos.dtype == "string"
+    assert rotulos.iloc[[0, 2, 3]].tolist() == ["2026-03", "2025-12", "2026-03"]
+    assert rotulos.isna().tolist() == [False, True, False, False]  # mês vazio fica <NA>
+    assert bridge_data.ordinal_mes(rotulos.iloc[0]) == ordinais.iloc[0]
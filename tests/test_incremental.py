@@ -0,0 +1,54 @@
+"""Ingestão incremental: linhas acrescentadas não refazem a aba inteira."""
+import shutil
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import bridge_data
+import bridge_incremental
+
+RAIZ = Path(__file__).resolve().parent.parent
+ABA = bridge_data.aba_consolidado(2025)
+LINHAS = [
+    ("03/02/2025", "Aceitou Jesus", "Copacabana", 23, "Sim", "21 99966-1825"),
+    ("10/03/2025", "Reconciliou com Jesus", "Tijuca", 41, "Não", "21 98888-7777"),
+    ("17/03/2025", "Pedido de oração", "Gávea", 15, "Sim", "21 97777-6666"),
+]
+
+
+@pytest.fixture
+def planilha(tmp_path):
+    shutil.copy(RAIZ / "bairros.json", tmp_path)  # o dicionário fica na pasta da planilha
+    caminho = tmp_path / "Consolidado_Bridge_2025.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = ABA
+    ws.append(bridge_data.COLUNAS_CONSOLIDADO)
+    for linha in LINHAS:
+        ws.append(linha)
+    wb.save(caminho)
+    return caminho
+
+
+def _acrescentar(caminho, linha):
+    wb = openpyxl.load_workbook(caminho)
+    wb[ABA].append(linha)
+    wb.save(caminho)
+
+
+def test_linha_com_idade_vazia_continua_incremental(planilha):
+    assert bridge_incremental.carregar(planilha, ABA)["modo"] == "completo"
+
+    # Idade vazia: a coluna lida passa de int64 para float64
+    _acrescentar(planilha, ("24/03/2025", "Aceitou Jesus", "Botafogo", None, "Sim", "21 96666-5555"))
+    incremental = bridge_incremental.carregar(planilha, ABA)
+    assert incremental["modo"] == "incremental"
+    assert incremental["linhas_novas"] == 1
+
+    bridge_incremental._caminho_estado(planilha, ABA).unlink()
+    completo = bridge_incremental.carregar(planilha, ABA)
+    assert completo["modo"] == "completo"
+    pd.testing.assert_frame_equal(incremental["df"], completo["df"])
+    pd.testing.assert_frame_equal(incremental["cubo"], completo["cubo"])
@@ -0,0 +1,77 @@
+"""Chave de telefone e cruzamento Bridge × Start."""
+import openpyxl
+import pandas as pd
+import pytest
+
+import bridge_data
+import bridge_start
+
+
+@pytest.mark.parametrize("valor, chave", [
+    # código do país, com e sem pontuação
+    ("+55 21 99966-1825", 21999661825),
+    ("5521999661825", 21999661825),
+    (5521999661825, 21999661825),
+    ("55 21 9628-9696", 21996289696),
+    # celular antigo de 8 dígitos ganha o nono dígito; fixo (2–5) não
+    ("21 9628-9696", 21996289696),
+    (2196289696, 21996289696),
+    ("(21) 6628-9696", 21966289696),
+    ("(21) 2628-9696", 2126289696),
+    # pontuação, espaços e o ".0" de célula numérica lida como float
+    ("(21) 99966-1825", 21999661825),
+    (" 21.99966.1825 ", 21999661825),
+    (21999661825.0, 21999661825),
+    # curto, vazio ou sem dígitos: sem chave
+    ("1234567", None),
+    ("", None),
+    ("   ", None),
+    ("não tem", None),
+    (None, None),
+])
+def test_normalizar_telefone(valor, chave):
+    resultado = bridge_data.normalizar_telefone(pd.Series([valor], dtype=object))
+    assert resultado.dtype == "Int64"
+    if chave is None:
+        assert resultado.isna().all()
+    else:
+        assert resultado.iloc[0] == chave
+
+
+def _planilha(caminho, aba, cabecalho, linhas):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = aba
+    ws.append(cabecalho)
+    for linha in linhas:
+        ws.append(linha)
+    wb.save(caminho)
+
+
+def test_indice_do_start_e_consolidado(tmp_path):
+    """O mesmo telefone escrito de outro jeito em cada planilha ainda cruza."""
+    _planilha(tmp_path / bridge_start.ARQUIVO_START, "Start", ["Nome", "Telefone"], [
+        ["Ana", "+55 (21) 99966-1825"],
+        ["Bia", 21996289696],  # célula numérica
+        ["Caio", "21 99966-1825"],  # repetido
+        ["Duda", "123"],
+    ])
+    ano = 2026
+    _planilha(tmp_path / f"Consolidado_Bridge_{ano}.xlsx", bridge_data.aba_consolidado(ano),
+              bridge_data.COLUNAS_CONSOLIDADO, [
+        ["02/01/2026", "Aceitou Jesus", "Gávea", 30, "Sim", "21999661825"],
+        ["03/01/2026", "Aceitou Jesus", "Gávea", 31, "Sim", 2196289696],  # sem o nono dígito
+        ["04/01/2026", "Pedido de oração", "Gávea", 32, "Não", "(21) 98888-7777"],
+        ["05/01/2026", "Pedido de oração", "Gávea", 33, "Não", None],
+        ["06/01/2026", "Pedido de oração", "Gávea", 34, "Não", "123"],
+    ])
+
+    start = bridge_data.ler_aba(tmp_path / bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START)
+    indice = bridge_start.montar_indice([start])
+    assert sorted(indice) == [21996289696, 21999661825]
+
+    df = bridge_data.preparar(bridge_data.ler_aba(
+        tmp_path / f"Consolidado_Bridge_{ano}.xlsx", bridge_data.aba_consolidado(ano), bridge_data.COLUNAS_CONSOLIDADO))
+    cruzados = bridge_start.participantes(df, indice)
+    assert cruzados["Idade"].tolist() == [30, 31]
+    assert cruzados["Chave"].tolist() == [21999661825, 21996289696]
@@ -0,0 +1,69 @@
+"""Visões por decisão: somar as visões dá o mesmo que recortar e agregar o cubo."""
+import shutil
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+import bridge_cubo
+import bridge_data
+import bridge_incremental
+import bridge_start
+import bridge_visoes
+from conftest import RAIZ
+
+ANOS = [2025, 2026]
+DECISOES = ["Aceitou Jesus", "Pedido de oração", "Reconciliou com Jesus"]
+SELECOES = [list(s) for n in range(len(DECISOES) + 1) for s in combinations(DECISOES, n)]
+
+
+@pytest.fixture(scope="module")
+def cubos(tmp_path_factory):
+    """{ano: (cubo, cubo do Start)} das planilhas reais, lidas numa cópia."""
+    pasta = tmp_path_factory.mktemp("planilhas")
+    for caminho in [*RAIZ.glob("*.xlsx"), RAIZ / "bairros.json"]:
+        shutil.copy(caminho, pasta)
+    indice = bridge_start.montar_indice([
+        bridge_data.ler_aba(pasta / bridge_start.ARQUIVO_START, 0, bridge_start.COLUNAS_START),
+        bridge_data.ler_aba(pasta / bridge_start.ARQUIVO_ANALISE_START, "Start", bridge_start.COLUNAS_START),
+    ])
+    resultado = {}
+    for ano in ANOS:
+        carga = bridge_incremental.carregar(pasta / f"Consolidado_Bridge_{ano}.xlsx", bridge_data.aba_consolidado(ano))
+        resultado[ano] = (carga["cubo"], bridge_cubo.montar_cubo(bridge_start.participantes(carga["df"], indice)))
+    return resultado
+
+
+def _igual(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for chave in a:
+            _igual(a[chave], b[chave])
+    else:
+        pd.testing.assert_series_equal(a, b)
+
+
+def test_pool_de_processos_igual_ao_serial(cubos):
+    _igual(bridge_visoes.materializar(cubos, processos=True), bridge_visoes.materializar(cubos, processos=False))
+
+
+@pytest.fixture(scope="module")
+def visoes_por_ano(cubos):
+    return bridge_visoes.materializar(cubos, processos=False)
+
+
+@pytest.mark.parametrize("decisoes", SELECOES, ids=lambda s: "+".join(s) or "todas")
+@pytest.mark.parametrize("anos", [[2025], [2026], ANOS], ids=lambda a: "+".join(map(str, a)))
+def test_visoes_iguais_ao_cubo_filtrado(cubos, visoes_por_ano, anos, decisoes):
+    v = bridge_visoes.compor(bridge_visoes.combinar(visoes_por_ano[ano] for ano in anos), decisoes)
+    cubo = bridge_cubo.filtrar(bridge_cubo.combinar(cubos[ano][0] for ano in anos), decisoes)
+    cubo_start = bridge_cubo.filtrar(bridge_cubo.combinar(cubos[ano][1] for ano in anos), decisoes)
+
+    assert bridge_visoes.metricas(v) == bridge_cubo.metricas(cubo)
+    for tabela, dim, base in [("decisao", "Decisão", cubo), ("bairro", "Bairro", cubo), ("start_bairro", "Bairro", cubo_start)]:
+        # mesmos valores, mesma ordem e mesmos dtypes (Bairro/Decisão como categoria)
+        pd.testing.assert_frame_equal(bridge_visoes.ranking(v, tabela, 10), bridge_cubo.ranking(base, dim, 10))
+    pd.testing.assert_frame_equal(bridge_visoes.serie_mensal(v), bridge_cubo.serie_mensal(cubo))
+    assert v["start_totais"].to_dict() == {
+        "Quantidade": bridge_cubo.total(cubo_start), "ContatoSim": bridge_cubo.total_contato(cubo_start, "Sim"),
+    }